@@ -0,0 +1,149 @@
+import argparse
+import hashlib
+import os
+import time
+
+from ColumnarCache import file_lock, read_binary, write_binary
+
+# On-disk store shared by every Streamlit (or query service) process on a host,
+# so that running several of them behind nginx does not repeat the work:
+#
+#   artifacts/store/<kind>/<key>.json       serialised figures
+#   artifacts/store/<kind>/<key>.feather    index and accuracy tables (memory-mapped on read)
+#
+# A key is the sha256 of everything the artifact is computed from (dataset
+# fingerprints, parameters) plus CODE_VERSION, a hash of the application's
+# modules, so a deployment with changed code never reads old artifacts. The
+# first process to miss an artifact computes it under a file lock while the
+# others wait and then read its result; files appear atomically.
+STORE_DIR = os.environ.get("LANDEX_ARTIFACT_STORE", "artifacts/store")
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _code_version() -> str:
+    digest = hashlib.sha256()
+    for filename in sorted(os.listdir(APP_DIR)):
+        if filename.endswith(".py"):
+            with open(os.path.join(APP_DIR, filename), "rb") as f:
+                digest.update(filename.encode() + f.read())
+    return digest.hexdigest()[:16]
+
+
+CODE_VERSION = _code_version()
+
+
+def content_key(*parts) -> str:
+    """A stable key for `parts` (strings, numbers and tuples of them) and the current code."""
+    return hashlib.sha256(repr((CODE_VERSION,) + parts).encode()).hexdigest()
+
+
+def artifact_path(kind: str, key: str, extension: str) -> str:
+    return os.path.join(STORE_DIR, kind, f"{key}.{extension}")
+
+
+def _get_or_create(path: str, read, write, compute):
+    value = read(path)
+    if value is None:
+        with file_lock(path):
+            value = read(path)
+            if value is None:
+                value = compute()
+                write(value, path)
+    return value
+
+
+def _read_text(path: str):
+    try:
+        with open(path) as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_text(text: str, path: str):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except OSError:
+        # A read-only store only means every process computes for itself.
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def shared_text(kind: str, key: str, compute) -> str:
+    """Return the text stored under `key`, computing and storing it in one process only."""
+    return _get_or_create(artifact_path(kind, key, "json"), _read_text, _write_text, compute)
+
+
+def shared_frame(kind: str, key: str, compute):
+    """Return the DataFrame stored under `key` (memory-mapped Feather), computing it once per host.
+
+    The frame must have a default index, as Feather does not store one.
+    """
+    return _get_or_create(artifact_path(kind, key, "feather"), read_binary, write_binary, compute)
+
+
+def ensure_file(path: str, build) -> str:
+    """Run `build()` to create `path` unless it exists, in one process at a time."""
+    if not os.path.exists(path):
+        with file_lock(path):
+            if not os.path.exists(path):
+                build()
+    return path
+
+
+def _remove(path: str) -> int:
+    try:
+        os.remove(path)
+        return 1
+    except FileNotFoundError:
+        return 0
+
+
+def _prune_artifact(path: str, cutoff: float) -> int:
+    # Under the artifact's lock, so no process is building it meanwhile; its lock
+    # file goes with it (file_lock copes with that).
+    with file_lock(path):
+        try:
+            if os.stat(path).st_mtime >= cutoff:
+                return 0
+        except FileNotFoundError:
+            pass
+        return _remove(path) + _remove(path + ".lock")
+
+
+def prune(days: float, store_dir: str = STORE_DIR) -> int:
+    """Delete artifacts not modified for `days` days and lock files without an artifact."""
+    cutoff = time.time() - days * 24 * 3600
+    removed = 0
+    for directory, _, filenames in os.walk(store_dir):
+        for filename in filenames:
+            path = os.path.join(directory, filename)
+            if filename.endswith(".lock"):
+                artifact = path[:-len(".lock")]
+                if os.path.exists(path) and not os.path.exists(artifact):
+                    # An artifact building right now keeps its lock: this waits, then finds it
+                    removed += _prune_artifact(artifact, float("inf"))
+            elif filename.endswith(".tmp"):
+                # Left by a process that died while writing
+                if os.stat(path).st_mtime < cutoff:
+                    removed += _remove(path)
+            else:
+                removed += _prune_artifact(path, cutoff)
+    return removed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Maintain the shared artifact store.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    prune_parser = subparsers.add_parser("prune", help="delete artifacts older than --days")
+    prune_parser.add_argument("--days", type=float, default=30)
+    args = parser.parse_args(argv)
+
+    print(f"removed {prune(args.days)} files from {STORE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
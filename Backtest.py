@@ -0,0 +1,234 @@
+import argparse
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ArtifactStore import content_key, shared_frame
+from CacheLayer import resource_cache
+from ColumnarCache import file_lock, read_binary, write_binary
+from DataRegistry import dataset_fingerprint, get_dataset
+from ForecastEngine import FORECAST_HORIZON, FORECAST_SERIES, fit_forecast, prepare_series
+from Instrumentation import measure, measured
+
+# Rolling-origin evaluation of the yearly forecasts. For every cutoff year a
+# model is trained on the rows up to the cutoff and predicts the mean price of
+# each of the following `horizon` years, which is compared with the observed
+# mean. Prophet is compared with a linear trend and a naive last-value forecast.
+#
+# Fold results are cached in artifacts/backtests/, keyed by a hash of the fold's
+# training and test rows, so new data only costs the folds it changes. The file
+# is shared by all series and processes: it is merged and rewritten under a file
+# lock, and folds no run has used for FOLD_TTL_DAYS (those of old data versions)
+# are dropped.
+BACKTEST_DIR = "artifacts/backtests"
+MODELS = ("prophet", "linear", "naive")
+MIN_TRAIN_YEARS = 8
+FOLD_TTL_DAYS = 30
+RESULT_COLUMNS = ["fold", "model", "cutoff", "year", "y", "yhat"]
+
+
+def _predict_prophet(train: pd.DataFrame, years: list) -> np.ndarray:
+    # Only yhat is scored, so no interval is computed
+    _, forecast = fit_forecast(prepare_series(train), horizon=max(years) - train["year"].max(), uncertainty="off")
+    yhat = pd.Series(forecast["yhat"].to_numpy(), index=forecast["ds"].dt.year)
+    return yhat.loc[years].to_numpy()
+
+
+def _predict_linear(train: pd.DataFrame, years: list) -> np.ndarray:
+    slope, intercept = np.polyfit(train["year"], train["avg_price_eur"], 1)
+    return intercept + slope * np.asarray(years, dtype=float)
+
+
+def _predict_naive(train: pd.DataFrame, years: list) -> np.ndarray:
+    last_year = train["year"].max()
+    return np.full(len(years), train.loc[train["year"] == last_year, "avg_price_eur"].mean())
+
+
+PREDICTORS = {
+    "prophet": _predict_prophet,
+    "linear": _predict_linear,
+    "naive": _predict_naive,
+}
+
+
+def folds(frame: pd.DataFrame, horizon: int = FORECAST_HORIZON, min_train: int = MIN_TRAIN_YEARS):
+    """Yield (cutoff, train rows, observed yearly means) for every rolling origin."""
+    years = np.sort(frame["year"].unique())
+    for cutoff in years[min_train - 1:-1]:
+        test = frame[(frame["year"] > cutoff) & (frame["year"] <= cutoff + horizon)]
+        yield int(cutoff), frame[frame["year"] <= cutoff], test.groupby("year")["avg_price_eur"].mean()
+
+
+def _fold_key(train: pd.DataFrame, actual: pd.Series, model: str) -> str:
+    digest = hashlib.sha1(model.encode())
+    digest.update(pd.util.hash_pandas_object(train, index=False).to_numpy().tobytes())
+    digest.update(pd.util.hash_pandas_object(actual).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _run_fold(cutoff, train, actual, models):
+    # Runs in a worker process; returns (result rows, {model: error}).
+    frames, errors = [], {}
+    years = [int(year) for year in actual.index]
+    for model, key in models.items():
+        try:
+            yhat = PREDICTORS[model](train, years)
+        except Exception as e:
+            errors[model] = f"{type(e).__name__}: {e}"
+            continue
+        frames.append(pd.DataFrame({"fold": key, "model": model, "cutoff": cutoff, "year": years,
+                                    "y": actual.to_numpy(dtype=float), "yhat": yhat}))
+    return frames, errors
+
+
+def _cache_path(cache_dir: str, horizon: int) -> str:
+    return os.path.join(cache_dir, f"folds-{horizon}y.feather")
+
+
+def _update_cache(path: str, new: list, used: set):
+    """Add `new` fold results to the cache file, mark the `used` folds and drop stale ones."""
+    now = time.time()
+    with file_lock(path):
+        # Read again: other processes may have added folds since this run read the file
+        cached = read_binary(path)
+        frames = [] if cached is None else [cached if "used" in cached else cached.assign(used=now)]
+        everything = pd.concat(frames + [frame.assign(used=now) for frame in new], ignore_index=True)
+        everything.loc[everything["fold"].isin(used), "used"] = now
+        everything = everything[everything["used"] > now - FOLD_TTL_DAYS * 24 * 3600]
+        # Folds computed by two processes at once are kept once
+        everything = everything.drop_duplicates(["fold", "year"], keep="last")
+        write_binary(everything[RESULT_COLUMNS + ["used"]], path)
+
+
+@measured("backtest")
+def backtest(df: pd.DataFrame, by=None, models=MODELS, horizon: int = FORECAST_HORIZON,
+             min_train: int = MIN_TRAIN_YEARS, workers: int = None, cache_dir: str = BACKTEST_DIR):
+    """Rolling-origin backtest of `models`, for all of `df` or per group of the `by` columns.
+
+    Folds are spread over a process pool (`workers=0` runs them in this process).
+    Returns one row per group, model, cutoff and predicted year, and a dict of
+    failed (group, cutoff, model) -> error.
+    """
+    by = [] if by is None else [by] if isinstance(by, str) else list(by)
+    groups = df.groupby(by, observed=True, sort=True) if by else [((), df)]
+    cache_path = _cache_path(cache_dir, horizon)
+    cached = read_binary(cache_path)
+    cached = {key: rows for key, rows in cached.groupby("fold")} if cached is not None else {}
+    # Refresh the last-used time of cached folds about once a day
+    refresh_after = time.time() - 24 * 3600
+    used, stale = set(), False
+
+    results, pending, failures = [], [], {}
+    for key, group in groups:
+        key = key if isinstance(key, tuple) else (key,)
+        frame = group[["year", "avg_price_eur"]].astype({"avg_price_eur": "float64"})
+        for cutoff, train, actual in folds(frame, horizon, min_train):
+            missing = {}
+            for model in models:
+                fold_key = _fold_key(train, actual, model)
+                if fold_key in cached:
+                    results.append((key, cached[fold_key]))
+                    used.add(fold_key)
+                    stale = stale or "used" not in cached[fold_key] or cached[fold_key]["used"].iloc[0] < refresh_after
+                else:
+                    missing[model] = fold_key
+            if missing:
+                pending.append((key, cutoff, train, actual, missing))
+
+    new = []
+    with measure("backtest_folds", folds=len(pending)):
+        if workers == 0:
+            outcomes = [_run_fold(*task[1:]) for task in pending]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                outcomes = list(pool.map(_run_fold, *zip(*[task[1:] for task in pending]))) if pending else []
+    for (key, cutoff, *_), (frames, errors) in zip(pending, outcomes):
+        results.extend((key, frame) for frame in frames)
+        new.extend(frames)
+        for model, error in errors.items():
+            failures[key + (cutoff, model)] = error
+    if new or stale:
+        _update_cache(cache_path, new, used)
+
+    frames = []
+    for key, rows in results:
+        rows = rows[RESULT_COLUMNS[1:]].copy()
+        for column, value in zip(by, key):
+            rows[column] = value
+        frames.append(rows)
+    columns = by + RESULT_COLUMNS[1:]
+    table = pd.concat(frames, ignore_index=True)[columns] if frames else pd.DataFrame(columns=columns)
+    return table, failures
+
+
+def metrics(predictions: pd.DataFrame, by=None) -> pd.DataFrame:
+    """MAE, RMSE and MAPE (%) per model (and per `by` group) over all folds and years."""
+    by = [] if by is None else [by] if isinstance(by, str) else list(by)
+    errors = predictions.assign(
+        abs_error=(predictions["yhat"] - predictions["y"]).abs(),
+        sq_error=(predictions["yhat"] - predictions["y"]) ** 2,
+        pct_error=100 * (predictions["yhat"] - predictions["y"]).abs() / predictions["y"].abs(),
+    )
+    grouped = errors.groupby(by + ["model"], observed=True, sort=False)
+    table = pd.DataFrame({
+        "MAE": grouped["abs_error"].mean(),
+        "RMSE": np.sqrt(grouped["sq_error"].mean()),
+        "MAPE (%)": grouped["pct_error"].mean(),
+        "predictions": grouped.size(),
+    })
+    return table.reset_index()
+
+
+def accuracy_table(name: str) -> pd.DataFrame:
+    """Backtest metrics of one page forecast series, computed once per version of its data."""
+    return _accuracy_table(name, dataset_fingerprint(FORECAST_SERIES[name]))
+
+
+@resource_cache(max_entries=50)
+def _accuracy_table(name: str, digest: str):
+    # Folds run in-process here: the page only asks for one series, and after
+    # `python Backtest.py` has run they all come from the fold cache.
+    def compute():
+        predictions, _ = backtest(get_dataset(FORECAST_SERIES[name]), workers=0)
+        return metrics(predictions).round(1)
+    return shared_frame("backtests", content_key("accuracy", name, digest), compute)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Backtest the forecast models with rolling-origin evaluation.")
+    parser.add_argument("names", nargs="*", help="series to backtest (default: all of %s)" % ", ".join(FORECAST_SERIES))
+    parser.add_argument("--by", nargs="+", help="backtest every group of these columns, e.g. land_type county")
+    parser.add_argument("--models", nargs="+", default=list(MODELS))
+    parser.add_argument("--horizon", type=int, default=FORECAST_HORIZON, help="years predicted from each cutoff")
+    parser.add_argument("--min-train", type=int, default=MIN_TRAIN_YEARS, help="years in the first training window")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--output", help="also write the metrics table to this CSV")
+    args = parser.parse_args(argv)
+    unknown = set(args.names) - set(FORECAST_SERIES)
+    if unknown:
+        parser.error("unknown series: " + ", ".join(sorted(unknown)))
+    unknown = set(args.models) - set(MODELS)
+    if unknown:
+        parser.error("unknown models: " + ", ".join(sorted(unknown)))
+
+    tables = []
+    for name in args.names or FORECAST_SERIES:
+        predictions, failures = backtest(get_dataset(FORECAST_SERIES[name]), args.by, args.models,
+                                         args.horizon, args.min_train, args.workers)
+        table = metrics(predictions, args.by)
+        table.insert(0, "series", name)
+        tables.append(table)
+        for key, error in failures.items():
+            print(f"{name}: failed {key}: {error}")
+    table = pd.concat(tables, ignore_index=True)
+    print(table.round(2).to_string(index=False))
+    if args.output:
+        table.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
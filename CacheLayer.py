@@ -0,0 +1,146 @@
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from DataRegistry import dataset_version
+
+# Process-wide memoisation shared by every Streamlit session, the CLI tools and
+# anything else importing these modules. `data_cache` is for values callers may
+# treat as their own (frames are handed out as shallow copies); `resource_cache`
+# is for shared objects such as fitted models, returned as-is.
+
+_caches = {}
+_MISSING = object()
+
+
+def _hash_frame(df: pd.DataFrame):
+    version = dataset_version(df)
+    if version is not None:
+        return ("dataset",) + version
+    # Frames derived from a dataset are hashed by content, which is much cheaper
+    # than pickling them and only done once per call.
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    digest.update(repr(list(df.columns)).encode())
+    return ("frame", digest.hexdigest())
+
+
+def make_key(value):
+    """Turn arguments into a hashable cache key, keying DataFrames by dataset version."""
+    if isinstance(value, pd.DataFrame):
+        return _hash_frame(value)
+    if isinstance(value, pd.Series):
+        return _hash_frame(value.to_frame())
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__,) + tuple(make_key(v) for v in value)
+    if isinstance(value, dict):
+        return ("dict",) + tuple(sorted((k, make_key(v)) for k, v in value.items()))
+    return value
+
+
+class _Cache:
+
+    def __init__(self, func, ttl, max_entries, copy_frames):
+        self.func = func
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.copy_frames = copy_frames
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def __call__(self, *args, **kwargs):
+        return self.get_or_compute(make_key((args, kwargs)), lambda: self.func(*args, **kwargs))
+
+    def get_or_compute(self, key, compute):
+        value = self._lookup(key)
+        if value is _MISSING:
+            # Only one caller computes a missing entry; the others wait for it.
+            with self._lock:
+                key_lock = self._key_locks.setdefault(key, threading.Lock())
+            with key_lock:
+                value = self._lookup(key, count=False)
+                if value is _MISSING:
+                    try:
+                        value = compute()
+                        self._store(key, value)
+                    finally:
+                        with self._lock:
+                            self.misses += 1
+                            self._key_locks.pop(key, None)
+        if self.copy_frames and isinstance(value, (pd.DataFrame, pd.Series)):
+            return value.copy(deep=False)
+        return value
+
+    def _lookup(self, key, count=True):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+                self._entries.move_to_end(key)
+                if count:
+                    self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            return _MISSING
+
+    def _store(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while self.max_entries and len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+def _decorator(ttl, max_entries, copy_frames):
+    def decorate(func):
+        cache = _Cache(func, ttl, max_entries, copy_frames)
+        _caches[f"{func.__module__}.{func.__qualname__}"] = cache
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return cache(*args, **kwargs)
+
+        wrapper.cache = cache
+        return wrapper
+    return decorate
+
+
+def keyed_cache(name: str, ttl: float = None, max_entries: int = None, copy_frames: bool = False):
+    """Return a named cache whose keys are chosen by the caller, via `get_or_compute(key, compute)`."""
+    cache = _Cache(None, ttl, max_entries, copy_frames)
+    _caches[name] = cache
+    return cache
+
+
+def data_cache(ttl: float = None, max_entries: int = None):
+    """Memoise a function returning data; DataFrame arguments are keyed by dataset version."""
+    return _decorator(ttl, max_entries, copy_frames=True)
+
+
+def resource_cache(ttl: float = None, max_entries: int = None):
+    """Memoise a function returning a shared object, handed to every caller as-is."""
+    return _decorator(ttl, max_entries, copy_frames=False)
+
+
+def cache_stats() -> dict:
+    """Hit/miss counters and entry counts for every cached function."""
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def clear_caches():
+    for cache in _caches.values():
+        cache.clear()
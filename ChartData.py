@@ -0,0 +1,93 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# Keeps the data sent to the browser per chart bounded as the datasets grow.
+# Scatter charts above the point budget are binned (one marker per populated
+# cell of a grid over x and y, per colour group), line and area series are
+# thinned with Largest-Triangle-Three-Buckets, and scatter charts with more
+# than WEBGL_THRESHOLD markers are drawn with WebGL instead of SVG.
+POINT_BUDGET = int(os.environ.get("LANDEX_POINT_BUDGET", 5000))
+# Plotly's own "auto" render mode switches at the same number of points per trace
+WEBGL_THRESHOLD = int(os.environ.get("LANDEX_WEBGL_THRESHOLD", 1000))
+
+
+def settings() -> tuple:
+    """The settings figures depend on, for cache keys."""
+    return POINT_BUDGET, WEBGL_THRESHOLD
+
+
+def render_mode(points: int) -> str:
+    return "webgl" if points > WEBGL_THRESHOLD else "svg"
+
+
+def _bins(values: np.ndarray, n_bins: int) -> np.ndarray:
+    # Log-spaced bins for positive, skewed values such as areas and volumes
+    values = np.log(values) if (values > 0).all() else values
+    edges = np.linspace(values.min(), values.max(), n_bins + 1)
+    return np.clip(np.searchsorted(edges, values, side="right") - 1, 0, n_bins - 1)
+
+
+def bin_scatter(df: pd.DataFrame, x: str, y: str, by: str = None, size: str = None,
+                budget: int = None) -> pd.DataFrame:
+    """Rows of `df` for a scatter of y against x, binned into at most about `budget` points.
+
+    Under the budget (default POINT_BUDGET) `df` is returned as is. Otherwise
+    each point is the mean x and y of one grid cell within one `by` group,
+    `size` is summed and `rows` counts the rows merged into it.
+    """
+    budget = budget or POINT_BUDGET
+    if len(df) <= budget:
+        return df
+    groups = df[by].nunique() if by else 1
+    n_bins = max(1, int(np.sqrt(budget / groups)))
+    binned = df.assign(_x=_bins(df[x].to_numpy(dtype=float), n_bins),
+                       _y=_bins(df[y].to_numpy(dtype=float), n_bins))
+    keys = ([by] if by else []) + ["_x", "_y"]
+    aggregations = {x: (x, "mean"), y: (y, "mean"), "rows": (x, "size")}
+    if size:
+        aggregations[size] = (size, "sum")
+    return binned.groupby(keys, observed=True).agg(**aggregations).reset_index().drop(columns=["_x", "_y"])
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of the `n_out` points of a series that Largest-Triangle-Three-Buckets keeps."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # First and last points are kept; the rest are split into n_out - 2 buckets
+    edges = (np.arange(n_out - 1) * (n - 2) / (n_out - 2)).astype(int) + 1
+    edges[-1] = n - 1
+    keep = np.empty(n_out, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    selected = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        # The point of this bucket forming the largest triangle with the previously
+        # kept point and the mean of the next bucket
+        mean_x, mean_y = x[stop:next_stop].mean(), y[stop:next_stop].mean()
+        areas = np.abs((x[selected] - mean_x) * (y[start:stop] - y[selected])
+                       - (x[selected] - x[start:stop]) * (mean_y - y[selected]))
+        selected = start + int(np.argmax(areas))
+        keep[i + 1] = selected
+    return keep
+
+
+def downsample_series(df: pd.DataFrame, x: str, y: str, by=None, budget: int = None) -> pd.DataFrame:
+    """Rows of `df` for line or area series of y over x (one per `by` group) within `budget` points.
+
+    The x values are chosen once, by LTTB on the sum of y over the groups, and
+    kept for every group, so stacked areas still add up at each kept x.
+    """
+    budget = budget or POINT_BUDGET
+    if len(df) <= budget:
+        return df
+    by = [] if by is None else [by] if isinstance(by, str) else list(by)
+    n_groups = df.groupby(by, observed=True).ngroups if by else 1
+    total = df.groupby(x, sort=True)[y].sum()
+    keep = total.index[lttb(total.index.to_numpy(), total.to_numpy(), max(3, budget // max(1, n_groups)))]
+    return df[df[x].isin(keep)].sort_values(by + [x])
@@ -0,0 +1,130 @@
+import contextlib
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover - the cache is an optimisation only
+    pa = None
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - no cross-process locking on Windows
+    fcntl = None
+
+# Binary copies of the CSVs under data/ live here. A copy records the mtime and
+# size of the CSV it was converted from and is ignored once the CSV changes. Its
+# file name carries a hash of the read_csv options (dtypes, separator, ...), so
+# callers reading one CSV with different schemas each get their own copy.
+CACHE_DIRNAME = ".cache"
+_SOURCE_KEY = b"landex.source"
+
+
+def cache_path(csv_path: str, suffix: str = "") -> str:
+    """Binary cache file for `csv_path`; `suffix` names a derived part of it (e.g. one country)."""
+    directory, filename = os.path.split(csv_path)
+    stem = os.path.splitext(filename)[0]
+    return os.path.join(directory, CACHE_DIRNAME, stem + suffix + ".feather")
+
+
+def options_suffix(read_csv_kwargs: dict) -> str:
+    """Cache file suffix identifying a set of read_csv options; empty for none."""
+    if not read_csv_kwargs:
+        return ""
+    options = json.dumps(read_csv_kwargs, sort_keys=True, default=str)
+    return "-" + hashlib.sha1(options.encode()).hexdigest()[:12]
+
+
+def source_stamp(csv_path: str) -> bytes:
+    stat = os.stat(csv_path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}".encode()
+
+
+@contextlib.contextmanager
+def file_lock(path: str):
+    """Hold an exclusive lock on `path`.lock, shared by every process on the host.
+
+    Used so that only one of several server processes builds a missing file
+    while the others wait for it. Without fcntl, or where the lock file cannot
+    be created, this does not lock. The holder may delete the lock file (see
+    ArtifactStore.prune); whoever was waiting on it then locks a new one.
+    """
+    lock_path = path + ".lock"
+    while True:
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            lock_file = open(lock_path, "a")
+        except OSError:
+            lock_file = None
+        if fcntl is None or lock_file is None:
+            yield
+            return
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            if os.fstat(lock_file.fileno()).st_ino == os.stat(lock_path).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        lock_file.close()
+    with lock_file:
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def read_binary(path: str, stamp: bytes = None):
+    """Memory-map a Feather file, returning None if it is missing or not built from `stamp`."""
+    if pa is None or not os.path.exists(path):
+        return None
+    try:
+        # The mapping stays open for as long as the table's buffers reference it.
+        reader = pa.ipc.open_file(pa.memory_map(path))
+        if stamp is not None and (reader.schema.metadata or {}).get(_SOURCE_KEY) != stamp:
+            return None
+        # One block per column lets numeric columns without nulls wrap the mapped
+        # pages instead of being copied (read-only, which copy-on-write handles);
+        # categorical codes and strings are still copied.
+        return reader.read_all().to_pandas(split_blocks=True)
+    except (OSError, pa.ArrowInvalid):
+        return None
+
+
+def write_binary(df: pd.DataFrame, path: str, stamp: bytes = None) -> bool:
+    """Atomically write `df` as uncompressed Feather (so it can be memory-mapped)."""
+    if pa is None:
+        return False
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if stamp is not None:
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), _SOURCE_KEY: stamp})
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # A single record batch, so columns are contiguous in the file and can be mapped as they are
+        feather.write_feather(table, tmp_path, compression="uncompressed", chunksize=max(table.num_rows, 1))
+        os.replace(tmp_path, path)
+    except OSError:
+        # A read-only data directory just means every load parses the CSV.
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return False
+    return True
+
+
+def read_csv_cached(csv_path: str, **read_csv_kwargs) -> pd.DataFrame:
+    """Read a CSV through its binary cache, converting it on first access or when stale."""
+    stamp = source_stamp(csv_path)
+    binary_path = cache_path(csv_path, options_suffix(read_csv_kwargs))
+    df = read_binary(binary_path, stamp)
+    if df is None:
+        # Another process may be converting the same CSV; wait for it and use its copy.
+        with file_lock(binary_path):
+            df = read_binary(binary_path, stamp)
+            if df is None:
+                df = pd.read_csv(csv_path, **read_csv_kwargs)
+                write_binary(df, binary_path, stamp)
+    return df
@@ -0,0 +1,204 @@
+import hashlib
+import os
+import threading
+import weakref
+from contextlib import contextmanager
+
+import pandas as pd
+
+from ColumnarCache import read_csv_cached
+from Instrumentation import measure
+
+# The frames handed out below (and by CacheLayer.data_cache) are shallow copies
+# sharing their column data. With copy-on-write a caller writing into one gets
+# its own copy of the column instead of changing it for every other session.
+pd.set_option("mode.copy_on_write", True)
+
+# Process-wide registry of the CSV datasets under data/. Each file is parsed once
+# per server process with an explicit schema and reloaded only when its mtime
+# changes; all sessions and both language pages share the same frames. Parsing
+# goes through ColumnarCache, so after the first start a load is a Feather read.
+#
+# Once hold_versions() has been called (by DataWatcher, in the app) changed files
+# are no longer picked up by readers: the watcher loads the new versions in
+# staged(), computes everything derived from them and then publish()es them, so
+# readers switch from one fully computed version to the next.
+DATA_DIR = "data"
+
+_PRICE = "float32"
+ESTONIA_DTYPES = {
+    "land_type": "category",
+    "county": "category",
+    "region": "category",
+    "year": "int16",
+    "number": "int32",
+    "average_area": "float32",
+    # Volumes are summed into totals of tens of millions, so keep them float64.
+    "total_volume_eur": "float64",
+    "price_min": _PRICE,
+    "price_max": _PRICE,
+    "price_per_unit_min": _PRICE,
+    "price_per_unit_max": _PRICE,
+    "price_per_unit_median": _PRICE,
+    "avg_price_eur": _PRICE,
+    "standard_deviation": _PRICE,
+}
+# The index is a few dozen rows served as-is (pages, QueryService), so it keeps
+# the CSV's float64 values rather than their float32 approximations.
+INDEX_DTYPES = {
+    "year": "int16",
+    "forest_avg_eur": "float64",
+    "farmland_avg_eur": "float64",
+    "all_average_eur": "float64",
+}
+
+# FAO extracts: semicolon separated with every field quoted.
+FAO_DTYPES = {
+    "Indicator name": "category",
+    "indicator": "category",
+    "Country name": "category",
+    "country": "category",
+    "time": "int16",
+    "value": "float64",
+}
+FAO_OPTIONS = {"sep": ";"}
+FRANCE_DTYPES = {
+    "land_type": "category",
+    "date": "int16",
+    "price": _PRICE,
+}
+
+DATASETS = {
+    "maaamet_farm_forest_2022": ("maaamet_farm_forest_2022.csv", ESTONIA_DTYPES),
+    "forest_land_estonia": ("forest_land_estonia.csv", ESTONIA_DTYPES),
+    "farmland_estonia": ("farmland_estonia.csv", ESTONIA_DTYPES),
+    "total_land_index": ("total_land_index.csv", INDEX_DTYPES),
+    "farmland_france": ("farmland_france.csv", FAO_DTYPES, FAO_OPTIONS),
+    "forest_land_france": ("forest_land_france.csv", FAO_DTYPES, FAO_OPTIONS),
+    "farm_forest_france": ("farm_forest_france.csv", FRANCE_DTYPES),
+}
+
+_lock = threading.Lock()
+# name -> (file stamp, frame, fingerprint) of the version served
+_frames = {}
+_fingerprints = {}
+_view_versions = {}
+_held = False
+_staging = threading.local()
+
+
+def dataset_path(name: str) -> str:
+    return os.path.join(DATA_DIR, DATASETS[name][0])
+
+
+def _stamp(path: str):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def fingerprint(path: str) -> str:
+    """Return the sha256 of a data file, memoised on its mtime and size."""
+    stamp = _stamp(path)
+    cached = _fingerprints.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    _fingerprints[path] = (stamp, digest.hexdigest())
+    return _fingerprints[path][1]
+
+
+def _load(name: str) -> pd.DataFrame:
+    filename, dtypes, *options = DATASETS[name]
+    csv_options = options[0] if options else {}
+    with measure("load", dataset=name) as m:
+        df = read_csv_cached(os.path.join(DATA_DIR, filename), dtype=dtypes, **csv_options)
+        m.rows = len(df)
+    return df
+
+
+def _read(name: str):
+    path = dataset_path(name)
+    stamp = _stamp(path)
+    return stamp, _load(name), fingerprint(path)
+
+
+def _entry(name: str):
+    staged = getattr(_staging, "entries", None)
+    if staged and name in staged:
+        return staged[name]
+    entry = _frames.get(name)
+    if entry is not None and _held:
+        return entry
+    stamp = _stamp(dataset_path(name))
+    if entry is None or entry[0] != stamp:
+        with _lock:
+            entry = _frames.get(name)
+            if entry is None or (entry[0] != stamp and not _held):
+                entry = _read(name)
+                _frames[name] = entry
+    return entry
+
+
+def get_dataset(name: str) -> pd.DataFrame:
+    """Return a read-only view of a registered dataset.
+
+    The view is a shallow copy sharing its column data with the registry, so
+    adding or replacing columns on it never affects other callers, and with
+    copy-on-write (enabled above) neither does writing into it.
+    """
+    _, df, digest = _entry(name)
+    view = df.copy(deep=False)
+    _view_versions[id(view)] = (name, digest)
+    weakref.finalize(view, _view_versions.pop, id(view), None)
+    return view
+
+
+def dataset_version(df: pd.DataFrame):
+    """Return (name, fingerprint) if `df` is a view handed out by get_dataset, else None.
+
+    Frames derived from a view (filtered, grouped, with added columns) are new
+    objects and therefore have no version.
+    """
+    return _view_versions.get(id(df))
+
+
+def dataset_fingerprint(name: str) -> str:
+    """Return the fingerprint of the version of a dataset get_dataset currently serves."""
+    if not _held and not getattr(_staging, "entries", None):
+        return fingerprint(dataset_path(name))
+    return _entry(name)[2]
+
+
+def hold_versions():
+    """Keep serving the loaded version of every dataset until publish() replaces it."""
+    global _held
+    _held = True
+
+
+def changed_datasets() -> list:
+    """Names of the loaded datasets whose file content differs from the served version."""
+    return [name for name, (_, _, digest) in list(_frames.items())
+            if fingerprint(dataset_path(name)) != digest]
+
+
+@contextmanager
+def staged(names):
+    """Load the current files of `names` and serve them to this thread only.
+
+    Yields the new entries, to be passed to publish() once everything derived
+    from them has been computed.
+    """
+    _staging.entries = {name: _read(name) for name in names}
+    try:
+        yield _staging.entries
+    finally:
+        _staging.entries = None
+
+
+def publish(entries: dict):
+    """Serve the staged `entries` to every reader from now on."""
+    with _lock:
+        _frames.update(entries)
@@ -0,0 +1,123 @@
+import argparse
+import logging
+import os
+import threading
+import time
+
+from DataRegistry import changed_datasets, dataset_path, fingerprint, hold_versions, publish, staged
+from Instrumentation import measure
+
+# Background refresh of everything derived from data/. A daemon thread polls the
+# data files (their mtime and size, and the sha256 of the ones that changed) and,
+# when a file changes, loads the new version for itself only, runs the warmers -
+# functions computing what readers will ask for, e.g. PageEngine.warm_up for
+# both pages - and then publishes the new version. Readers keep getting the old
+# data and its cached figures, tables and forecasts until the new ones are ready.
+#
+#   LANDEX_WATCH_INTERVAL=30     seconds between polls; 0 turns the watcher (and the warm-up) off
+#
+# The first pass, at start, warms the caches for the current data.
+POLL_INTERVAL = float(os.environ.get("LANDEX_WATCH_INTERVAL", 30))
+# A file modified more recently than this may still be being written
+SETTLE_SECONDS = 2
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_watcher = None
+
+
+class DataWatcher:
+
+    def __init__(self, warmers, interval: float = POLL_INTERVAL):
+        self.warmers = list(warmers)
+        self.interval = interval
+        self.warmed = False
+        self._failed = set()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def warm(self):
+        with measure("warm_up", warmers=len(self.warmers)):
+            for warm in self.warmers:
+                warm()
+
+    def refresh(self) -> list:
+        """Warm the caches for changed data files and publish them; returns the changed datasets."""
+        if not self.warmed:
+            hold_versions()
+            try:
+                self.warm()
+            finally:
+                # Even after a failure: readers then compute on demand, and the full
+                # warm-up is not rerun on every poll, only for the next changed file
+                self.warmed = True
+            return []
+        changed = changed_datasets()
+        if not changed or any(time.time() - os.stat(dataset_path(name)).st_mtime < SETTLE_SECONDS
+                              for name in changed):
+            return []
+        versions = frozenset((name, fingerprint(dataset_path(name))) for name in changed)
+        if versions in self._failed:
+            return []
+        try:
+            with staged(changed) as entries:
+                self.warm()
+        except Exception:
+            # Keep serving the previous version; this one is retried once a file changes again
+            logger.exception("refreshing %s failed", ", ".join(changed))
+            self._failed.add(versions)
+            return []
+        publish(entries)
+        return changed
+
+    def run(self):
+        while True:
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception("data watcher pass failed")
+            if self._stop.wait(self.interval):
+                return
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, name="DataWatcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def start_watcher(warmers, interval: float = POLL_INTERVAL):
+    """Start the process-wide watcher with `warmers` unless it runs already (or interval is 0)."""
+    global _watcher
+    if interval <= 0:
+        return None
+    with _lock:
+        if _watcher is None:
+            _watcher = DataWatcher(warmers, interval).start()
+    return _watcher
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compute the pages' figures, tables and forecasts into the shared artifact store.")
+    parser.add_argument("--locales", nargs="+", help="pages to warm (default: all)")
+    args = parser.parse_args(argv)
+
+    from PageEngine import warm_up
+    from PageText import TEXT
+    unknown = set(args.locales or ()) - set(TEXT)
+    if unknown:
+        parser.error("unknown locales: " + ", ".join(sorted(unknown)))
+
+    start = time.perf_counter()
+    warm_up(args.locales or tuple(TEXT))
+    print(f"warmed in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
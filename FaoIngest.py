@@ -0,0 +1,125 @@
+import argparse
+
+import pandas as pd
+
+from ColumnarCache import cache_path, file_lock, read_binary, source_stamp, write_binary
+from DataRegistry import DATASETS, dataset_path
+from Instrumentation import measure
+
+# The FAO extracts hold every country of the world, while a page needs one
+# country's series. Files are streamed in chunks through a chain of generators
+# (read -> filter -> numeric) and only the matching rows are kept, one compact
+# Feather file per country next to the other binary caches:
+#
+#   data/.cache/farmland_france-FRA.feather    indicator, time, value
+#
+# When only some indicators are kept, their codes are appended to the name. A
+# country file records the stamp of the CSV it came from and is rebuilt once
+# the CSV changes, like the whole-file caches of ColumnarCache. A requested
+# country without rows gets an empty file, so it is not looked for again.
+FAO_DATASETS = [name for name, (_, dtypes, *_) in DATASETS.items() if "indicator" in dtypes]
+CHUNK_ROWS = 2000
+SERIES_COLUMNS = ["indicator", "time", "value"]
+
+
+def read_chunks(name: str, chunksize: int = CHUNK_ROWS):
+    """Yield the raw rows of an FAO dataset, `chunksize` rows at a time, as strings."""
+    options = DATASETS[name][2] if len(DATASETS[name]) > 2 else {}
+    yield from pd.read_csv(dataset_path(name), dtype=str, chunksize=chunksize,
+                           usecols=["indicator", "country", "time", "value"], **options)
+
+
+def filter_rows(chunks, countries=None, indicators=None):
+    """Keep the rows of the given country codes and indicator codes (None keeps all)."""
+    for chunk in chunks:
+        mask = pd.Series(True, index=chunk.index)
+        if countries is not None:
+            mask &= chunk["country"].isin(countries)
+        if indicators is not None:
+            mask &= chunk["indicator"].isin(indicators)
+        if mask.any():
+            yield chunk[mask]
+
+
+def to_numeric(chunks):
+    """Convert time and value to numbers, dropping rows where either is missing."""
+    for chunk in chunks:
+        chunk = chunk.assign(time=pd.to_numeric(chunk["time"], errors="coerce"),
+                             value=pd.to_numeric(chunk["value"], errors="coerce"))
+        yield chunk.dropna(subset=["time", "value"])
+
+
+def _series(parts) -> pd.DataFrame:
+    df = pd.concat(parts, ignore_index=True)[SERIES_COLUMNS] if parts else pd.DataFrame(columns=SERIES_COLUMNS)
+    return df.astype({"indicator": "category", "time": "int16", "value": "float64"}) \
+        .sort_values(["indicator", "time"], ignore_index=True)
+
+
+def series_path(name: str, country: str, indicators=None) -> str:
+    suffix = f"-{country}" if indicators is None else f"-{country}-{'+'.join(sorted(indicators))}"
+    return cache_path(dataset_path(name), suffix)
+
+
+def _stream(name: str, countries, indicators, chunksize: int = CHUNK_ROWS) -> dict:
+    # {country: series}, including empty series for requested countries without rows
+    parts = {country: [] for country in countries or ()}
+    with measure("ingest", dataset=name) as m:
+        for chunk in to_numeric(filter_rows(read_chunks(name, chunksize), countries, indicators)):
+            for country, rows in chunk.groupby("country"):
+                parts.setdefault(country, []).append(rows)
+        series = {country: _series(rows) for country, rows in parts.items()}
+        m.rows = sum(len(df) for df in series.values())
+    return series
+
+
+def ingest(name: str, countries=None, indicators=None, chunksize: int = CHUNK_ROWS) -> dict:
+    """Stream an FAO dataset once and write one series per country to the binary cache.
+
+    Returns {country code: series} of the countries with rows. Only the
+    filtered rows are ever held in memory.
+    """
+    stamp = source_stamp(dataset_path(name))
+    series = _stream(name, countries, indicators, chunksize)
+    for country, df in series.items():
+        path = series_path(name, country, indicators)
+        with file_lock(path):
+            write_binary(df, path, stamp)
+    return {country: df for country, df in series.items() if len(df)}
+
+
+def country_series(name: str, country: str = "FRA", indicators=None) -> pd.DataFrame:
+    """Return one country's series of an FAO dataset, ingesting it on first use or when stale."""
+    path = series_path(name, country, indicators)
+    stamp = source_stamp(dataset_path(name))
+    df = read_binary(path, stamp)
+    if df is None:
+        # Only one process streams the file; the others wait and read its result
+        with file_lock(path):
+            df = read_binary(path, stamp)
+            if df is None:
+                df = _stream(name, [country], indicators)[country]
+                write_binary(df, path, stamp)
+    if df.empty:
+        raise KeyError(f"{name} has no rows for country {country!r}")
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract per-country series from the FAO datasets.")
+    parser.add_argument("names", nargs="*", help=f"datasets (default: all of {', '.join(FAO_DATASETS)})")
+    parser.add_argument("--country", nargs="+", help="ISO3 country codes (default: every country)")
+    parser.add_argument("--indicator", nargs="+", help="indicator codes (default: every indicator)")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+    unknown = set(args.names) - set(FAO_DATASETS)
+    if unknown:
+        parser.error(f"unknown dataset(s): {', '.join(sorted(unknown))}")
+
+    for name in args.names or FAO_DATASETS:
+        series = ingest(name, args.country, args.indicator, args.chunksize)
+        rows = sum(len(df) for df in series.values())
+        print(f"{name}: {len(series)} countries, {rows} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import plotly.io as pio
+
+from ArtifactStore import content_key, shared_text
+from CacheLayer import keyed_cache, make_key
+from ChartData import settings as chart_settings
+from Instrumentation import measure
+
+# Figures are built once per figure name, language and input data version and
+# kept as serialised JSON; a rerun only rehydrates the JSON into a Figure, so no
+# Plotly Express work happens in steady state. The JSON also goes to the shared
+# ArtifactStore, so other server processes on the host load it instead of
+# building the figure again.
+_figures = keyed_cache("FigureCache.figures", max_entries=200)
+
+
+def cached_figure(name: str, builder, *inputs, lang: str = None):
+    """Return the figure `builder()` makes, building it only for new `inputs` versions.
+
+    `inputs` are the DataFrames (or any hashable version tokens) the figure is
+    drawn from. Pass `lang` only for figures containing localised text, so the
+    rest are shared between the language pages.
+    """
+    key = (name, lang, make_key(inputs), chart_settings())
+    return pio.from_json(_figures.get_or_compute(key, lambda: _load_or_build(key, builder)))
+
+
+def _load_or_build(key, builder):
+    return shared_text("figures", content_key(key), lambda: _build(key[0], builder))
+
+
+def _build(name, builder):
+    with measure("figure_build", figure=name) as m:
+        text = builder().to_json()
+        m.set(payload_kib=round(len(text) / 1024, 1))
+        return text
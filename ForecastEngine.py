@@ -0,0 +1,238 @@
+import argparse
+import json
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from io import StringIO
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from ArtifactStore import ensure_file
+from CacheLayer import resource_cache
+from ColumnarCache import file_lock
+from DataRegistry import dataset_fingerprint, dataset_path, fingerprint, get_dataset
+from Instrumentation import measure, measured
+
+# Fitted forecasts are written here by `python ForecastEngine.py build` and
+# picked up by the pages, so that no browser session has to fit a model.
+ARTIFACT_DIR = "artifacts/forecasts"
+
+# Forecast series name -> DataRegistry dataset it is fitted on.
+FORECAST_SERIES = {
+    "forest": "forest_land_estonia",
+    "farmland": "farmland_estonia",
+    "farm_forest": "maaamet_farm_forest_2022",
+}
+
+# The land data is yearly, so forecasts are made at annual frequency for a
+# fixed number of years past the last observation.
+FORECAST_FREQ = "YS"
+FORECAST_HORIZON = 4
+
+# How the forecast interval (yhat_lower/yhat_upper) is computed, as the number of
+# posterior-predictive samples Prophet draws. Sampling is always vectorised
+# (all samples drawn as one array); "analytic" draws none and puts a normal
+# band of the fitted observation noise around yhat, which leaves out trend
+# uncertainty; "off" has no interval at all.
+UNCERTAINTY_MODES = {
+    "full": 1000,
+    "reduced": 200,
+    "analytic": 0,
+    "off": 0,
+}
+FORECAST_UNCERTAINTY = "reduced"
+
+
+def artifact_path(name: str, digest: str, artifact_dir: str = ARTIFACT_DIR,
+                  horizon: int = FORECAST_HORIZON, freq: str = FORECAST_FREQ,
+                  uncertainty: str = FORECAST_UNCERTAINTY) -> str:
+    return os.path.join(artifact_dir, f"{name}-{horizon}{freq}-{uncertainty}-{digest[:16]}.json")
+
+
+def prepare_series(df: pd.DataFrame) -> pd.DataFrame:
+    return pd.DataFrame({
+        "ds": pd.to_datetime(df["year"].astype(str), format="%Y"),
+        "y": df["avg_price_eur"].to_numpy(),
+    })
+
+
+def analytic_interval(m, forecast: pd.DataFrame) -> pd.DataFrame:
+    """Add yhat_lower/yhat_upper as yhat -/+ z * the fitted observation noise."""
+    z = NormalDist().inv_cdf(0.5 + m.interval_width / 2)
+    sigma = float(np.mean(m.params["sigma_obs"])) * m.y_scale
+    return forecast.assign(yhat_lower=forecast["yhat"] - z * sigma, yhat_upper=forecast["yhat"] + z * sigma)
+
+
+def fit_forecast(df: pd.DataFrame, horizon: int = FORECAST_HORIZON, freq: str = FORECAST_FREQ,
+                 uncertainty: str = FORECAST_UNCERTAINTY):
+    """Fit a Prophet model on a prepared (ds, y) frame and predict `horizon` periods past the data."""
+    from prophet import Prophet
+
+    m = Prophet(uncertainty_samples=UNCERTAINTY_MODES[uncertainty])
+    m.fit(df)
+    # Only the future rows are built and predicted, at the data's own frequency.
+    future = m.make_future_dataframe(periods=horizon, freq=freq, include_history=False)
+    forecast = m.predict(future, vectorized=True)
+    if uncertainty == "analytic":
+        forecast = analytic_interval(m, forecast)
+    return m, forecast
+
+
+def _fit_group(key, frame: pd.DataFrame, timeout, horizon, uncertainty):
+    # Runs in a worker process. The alarm bounds a single group's fit, so a stuck
+    # group fails on its own instead of holding up the whole batch.
+    use_alarm = timeout and hasattr(signal, "SIGALRM")
+    if use_alarm:
+        def on_alarm(signum, stack):
+            raise TimeoutError(f"fit exceeded {timeout}s")
+        signal.signal(signal.SIGALRM, on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        m, forecast = fit_forecast(prepare_series(frame), horizon, uncertainty=uncertainty)
+        return key, forecast.reindex(columns=["ds", "yhat", "yhat_lower", "yhat_upper"]), None
+    except Exception as e:
+        return key, None, f"{type(e).__name__}: {e}"
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+@measured("forecast_groups")
+def forecast_groups(df: pd.DataFrame, by, workers: int = None, timeout: float = None,
+                    horizon: int = FORECAST_HORIZON, uncertainty: str = FORECAST_UNCERTAINTY):
+    """Fit one model per group of `df` across a process pool.
+
+    Returns a tidy table with the `by` columns followed by ds/yhat/yhat_lower/yhat_upper,
+    and a dict mapping each failed group key to its error message. With
+    uncertainty "off" the interval columns are empty.
+    """
+    by = [by] if isinstance(by, str) else list(by)
+    frames = []
+    failures = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_fit_group, key, group[["year", "avg_price_eur"]], timeout, horizon, uncertainty): key
+            for key, group in df.groupby(by, observed=True, sort=True)
+        }
+        for future, key in futures.items():
+            try:
+                key, forecast, error = future.result()
+            except Exception as e:  # e.g. a crashed worker breaking the pool
+                error = f"{type(e).__name__}: {e}"
+            if error is not None:
+                failures[key] = error
+                continue
+            forecast = forecast.copy()
+            for column, value in zip(by, key):
+                forecast[column] = value
+            frames.append(forecast)
+    columns = by + ["ds", "yhat", "yhat_lower", "yhat_upper"]
+    table = pd.concat(frames, ignore_index=True)[columns] if frames else pd.DataFrame(columns=columns)
+    return table, failures
+
+
+def build_forecast(name: str, artifact_dir: str = ARTIFACT_DIR, uncertainty: str = FORECAST_UNCERTAINTY) -> str:
+    """Fit the named series and write model and forecast to its artifact file."""
+    from prophet.serialize import model_to_json
+
+    source = dataset_path(FORECAST_SERIES[name])
+    digest = dataset_fingerprint(FORECAST_SERIES[name])
+    with measure("fit", series=name) as span:
+        series = prepare_series(get_dataset(FORECAST_SERIES[name]))
+        span.rows = len(series)
+        m, forecast = fit_forecast(series, uncertainty=uncertainty)
+    artifact = {
+        "name": name,
+        "uncertainty": uncertainty,
+        "source": source,
+        "fingerprint": digest,
+        "model": model_to_json(m),
+        "forecast": forecast.to_json(orient="table", date_format="iso"),
+    }
+    path = artifact_path(name, digest, artifact_dir, uncertainty=uncertainty)
+    os.makedirs(artifact_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w") as f:
+            json.dump(artifact, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def _read_artifact(path: str):
+    from prophet.serialize import model_from_json
+
+    with measure("load_forecast", path=path):
+        with open(path) as f:
+            artifact = json.load(f)
+        forecast = pd.read_json(StringIO(artifact["forecast"]), orient="table")
+        return model_from_json(artifact["model"]), forecast
+
+
+def load_forecast(name: str, artifact_dir: str = ARTIFACT_DIR, uncertainty: str = FORECAST_UNCERTAINTY):
+    """Return (model, forecast) for a series, refitting only if its data changed."""
+    return _load_forecast(name, dataset_fingerprint(FORECAST_SERIES[name]), artifact_dir, uncertainty)
+
+
+@resource_cache(max_entries=50)
+def _load_forecast(name: str, digest: str, artifact_dir: str, uncertainty: str):
+    path = artifact_path(name, digest, artifact_dir, uncertainty=uncertainty)
+    # With several server processes only one fits a missing model; the rest wait and load it.
+    ensure_file(path, lambda: build_forecast(name, artifact_dir, uncertainty))
+    return _read_artifact(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the Prophet forecasts shown on the index pages.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="fit series and write forecast artifacts")
+    build.add_argument("names", nargs="*", help="series to build (default: all of %s)" % ", ".join(FORECAST_SERIES))
+    build.add_argument("--artifact-dir", default=ARTIFACT_DIR)
+    build.add_argument("--force", action="store_true", help="refit even if an artifact for the current data exists")
+    build.add_argument("--uncertainty", default=FORECAST_UNCERTAINTY, choices=list(UNCERTAINTY_MODES),
+                       help="forecast interval mode")
+    batch = subparsers.add_parser("batch", help="fit one model per group of the combined dataset")
+    batch.add_argument("--by", nargs="+", default=["land_type", "county"], help="grouping columns")
+    batch.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    batch.add_argument("--timeout", type=float, default=None, help="seconds allowed per group fit")
+    batch.add_argument("--horizon", type=int, default=FORECAST_HORIZON, help="years to forecast")
+    batch.add_argument("--uncertainty", default=FORECAST_UNCERTAINTY, choices=list(UNCERTAINTY_MODES),
+                       help="forecast interval mode")
+    batch.add_argument("--artifact-dir", default=ARTIFACT_DIR)
+    args = parser.parse_args(argv)
+
+    if args.command == "batch":
+        source = dataset_path(FORECAST_SERIES["farm_forest"])
+        table, failures = forecast_groups(get_dataset(FORECAST_SERIES["farm_forest"]), args.by,
+                                          args.workers, args.timeout, args.horizon, args.uncertainty)
+        os.makedirs(args.artifact_dir, exist_ok=True)
+        path = os.path.join(args.artifact_dir, f"groups-{'-'.join(args.by)}-{args.horizon}{FORECAST_FREQ}-{args.uncertainty}-{fingerprint(source)[:16]}.csv")
+        table.to_csv(path, index=False)
+        print(f"wrote {table.groupby(args.by).ngroups} group forecasts to {path}")
+        for key, error in failures.items():
+            print(f"failed {key}: {error}")
+        return
+
+    unknown = set(args.names) - set(FORECAST_SERIES)
+    if unknown:
+        parser.error("unknown series: " + ", ".join(sorted(unknown)))
+
+    for name in args.names or FORECAST_SERIES:
+        path = artifact_path(name, fingerprint(dataset_path(FORECAST_SERIES[name])), args.artifact_dir,
+                             uncertainty=args.uncertainty)
+        # Under the lock a server process building the same artifact also takes (see ensure_file)
+        with file_lock(path):
+            if os.path.exists(path) and not args.force:
+                print(f"{name}: up to date ({path})")
+                continue
+            print(f"{name}: wrote {build_forecast(name, args.artifact_dir, args.uncertainty)}")
+
+
+if __name__ == "__main__":
+    main()
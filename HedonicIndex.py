@@ -0,0 +1,113 @@
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sparse
+from scipy.sparse.linalg import lsqr
+
+from ArtifactStore import content_key, shared_frame
+from CacheLayer import data_cache, make_key
+from DataRegistry import DATA_DIR, get_dataset
+from Instrumentation import measure
+
+# Quality-adjusted land price index. The yearly mean of avg_price_eur moves with
+# the mix of regions sold in a year; here
+#
+#   log(avg_price_eur) = year + region + land_type
+#
+# is fitted by weighted least squares over all rows at once, and the year
+# effects, relative to the first year, are the index. The design matrix is a
+# sparse matrix of dummies (a handful of non-zeros per row), so one solve is
+# linear in the number of rows.
+HEDONIC_INDEX_PATH = os.path.join(DATA_DIR, "hedonic_land_index.csv")
+WEIGHTS = ("number", "total_volume_eur")
+EFFECTS = ("region", "land_type")
+
+
+def _dummies(codes: np.ndarray, offset: int, drop_first: bool):
+    """Row and column indices of the one-hot columns for integer `codes`."""
+    rows = np.arange(len(codes))
+    if drop_first:
+        keep = codes > 0
+        return rows[keep], offset + codes[keep] - 1
+    return rows, offset + codes
+
+
+def fit_year_effects(df: pd.DataFrame, weights: str = "number", effects=EFFECTS) -> pd.Series:
+    """Weighted least-squares year effects of log price, controlling for `effects`.
+
+    Every year gets a dummy (they absorb the intercept); the other effects drop
+    their first level. Returns the log effect per year.
+    """
+    df = df[df["avg_price_eur"] > 0]
+    if weights is not None:
+        df = df[df[weights] > 0]
+    years, year_levels = pd.factorize(df["year"].to_numpy(), sort=True)
+    rows, cols = [_dummies(years, 0, drop_first=False)], []
+    n_columns = len(year_levels)
+    for effect in effects:
+        # Region names are only unique within a county
+        values = df["county"].astype(str) + "/" + df[effect].astype(str) if effect == "region" else df[effect]
+        codes, levels = pd.factorize(np.asarray(values), sort=True)
+        rows.append(_dummies(codes, n_columns, drop_first=True))
+        n_columns += len(levels) - 1
+    row_index = np.concatenate([r for r, _ in rows])
+    col_index = np.concatenate([c for _, c in rows])
+
+    # Weighted least squares: scale each row by the square root of its weight
+    sqrt_w = np.sqrt(df[weights].to_numpy(dtype=float)) if weights is not None else np.ones(len(df))
+    design = sparse.csr_matrix((sqrt_w[row_index], (row_index, col_index)), shape=(len(df), n_columns))
+    target = np.log(df["avg_price_eur"].to_numpy(dtype=float)) * sqrt_w
+    coefficients, stop, iterations = lsqr(design, target, atol=1e-12, btol=1e-12, iter_lim=10 * n_columns)[:3]
+    # 1, 2, 4 and 5 are converged (0: all-zero target); 3, 6 and 7 are an ill-conditioned design
+    # or the iteration limit, whose effects must not become an index
+    if stop in (3, 6, 7):
+        raise RuntimeError(f"hedonic fit did not converge (lsqr stop {stop} after {iterations} iterations)")
+    return pd.Series(coefficients[:len(year_levels)], index=pd.Index(year_levels, name="year"))
+
+
+def chain(year_effects: pd.Series, base: float = 100.0) -> pd.DataFrame:
+    """Index levels (first year = `base`) and year-on-year changes from log year effects."""
+    log_index = year_effects - year_effects.iloc[0]
+    return pd.DataFrame({
+        "index": base * np.exp(log_index),
+        "change_pct": 100 * np.expm1(log_index.diff()),
+    })
+
+
+@data_cache(max_entries=50)
+def hedonic_index(df: pd.DataFrame, weights: str = "number", by: str = None) -> pd.DataFrame:
+    """The chained quality-adjusted index of `df`, for all rows or separately per `by` group."""
+    key = content_key("hedonic", make_key(df), weights, by)
+    return shared_frame("indices", key, lambda: _hedonic_index(df, weights, by))
+
+
+def _hedonic_index(df, weights, by):
+    with measure("hedonic_fit", weights=weights, by=by) as m:
+        m.rows = len(df)
+        if by is None:
+            return chain(fit_year_effects(df, weights)).reset_index()
+        effects = tuple(effect for effect in EFFECTS if effect != by)
+        # Region names are only unique within a county
+        keys = ["county", "region"] if by == "region" else [by]
+        parts = {group: chain(fit_year_effects(rows, weights, effects))
+                 for group, rows in df.groupby(keys, observed=True)}
+        return pd.concat(parts, names=keys).reset_index()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit the quality-adjusted (hedonic) land price index.")
+    parser.add_argument("--weights", default="number", choices=WEIGHTS + ("none",))
+    parser.add_argument("--by", choices=EFFECTS, help="fit a separate index per group, e.g. land_type")
+    parser.add_argument("--output", default=HEDONIC_INDEX_PATH)
+    args = parser.parse_args(argv)
+
+    weights = None if args.weights == "none" else args.weights
+    index = hedonic_index(get_dataset("maaamet_farm_forest_2022"), weights, args.by)
+    index.to_csv(args.output, index=False)
+    print(f"wrote {len(index)} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import argparse
+import os
+
+import pandas as pd
+
+from ColumnarCache import read_binary, write_binary
+from DataRegistry import DATA_DIR, dataset_path
+
+# Builds the yearly land price indices from the raw Maa-amet rows instead of
+# maintaining total_land_index.csv by hand. The builder keeps per (year, land
+# type, county) running sums, so appending a new year's rows only touches the
+# aggregates and index rows of that year.
+STATE_DIR = "artifacts/index"
+KEYS = ["year", "land_type", "county"]
+LAND_TYPES = {"Forest land": "forest", "Farmland": "farmland"}
+
+TOTAL_INDEX_PATH = os.path.join(DATA_DIR, "total_land_index.csv")
+COUNTY_INDEX_PATH = os.path.join(DATA_DIR, "county_land_index.csv")
+# Column names of the hand-made total_land_index.csv, which the pages read
+TOTAL_INDEX_COLUMNS = {
+    "forest_avg_eur": "forest_avg_eur",
+    "farmland_avg_eur": "farmland_avg_eur",
+    "all_avg_eur": "all_average_eur",
+}
+
+
+def read_raw(path: str = None) -> pd.DataFrame:
+    # Prices stay float64 here (the registry uses float32) so sums are exact.
+    path = path or dataset_path("maaamet_farm_forest_2022")
+    return pd.read_csv(path, dtype={"land_type": "category", "county": "category", "region": "category"})
+
+
+def _aggregate(rows: pd.DataFrame) -> pd.DataFrame:
+    rows = rows.assign(weighted=rows["avg_price_eur"] * rows["total_volume_eur"])
+    grouped = rows.groupby(KEYS, observed=True)
+    return pd.DataFrame({
+        "n": grouped.size(),
+        "price_sum": grouped["avg_price_eur"].sum(),
+        "weighted_sum": grouped["weighted"].sum(),
+        "volume_sum": grouped["total_volume_eur"].sum(),
+        "number_sum": grouped["number"].sum(),
+    })
+
+
+def _indices(aggregates: pd.DataFrame, prices: pd.DataFrame, by: list) -> pd.DataFrame:
+    sums = aggregates.groupby(level=by, observed=True).sum()
+    return pd.DataFrame({
+        "avg_eur": sums["price_sum"] / sums["n"],
+        "weighted_eur": sums["weighted_sum"] / sums["volume_sum"],
+        "median_eur": prices.groupby(by, observed=True)["avg_price_eur"].median(),
+        "volume_eur": sums["volume_sum"],
+        "number": sums["number_sum"],
+    })
+
+
+class LandIndex:
+    """Yearly (and per county) mean, volume-weighted and median price indices."""
+
+    def __init__(self, aggregates: pd.DataFrame, prices: pd.DataFrame):
+        self.aggregates = aggregates
+        self.prices = prices
+        self._yearly = self._derive_yearly(aggregates, prices)
+        self._county = self._derive_county(aggregates, prices)
+
+    @classmethod
+    def from_rows(cls, rows: pd.DataFrame) -> "LandIndex":
+        return cls(_aggregate(rows), rows[KEYS + ["avg_price_eur"]].reset_index(drop=True))
+
+    @property
+    def years(self):
+        return sorted(self.aggregates.index.get_level_values("year").unique())
+
+    def append(self, rows: pd.DataFrame):
+        """Add the rows of years not yet in the index, updating only those years."""
+        years = set(rows["year"].unique())
+        overlap = years & set(self.years)
+        if overlap:
+            raise ValueError(f"index already contains year(s) {sorted(int(year) for year in overlap)}; rebuild it instead")
+        new = _aggregate(rows)
+        new_prices = rows[KEYS + ["avg_price_eur"]]
+        self.aggregates = pd.concat([self.aggregates, new]).sort_index()
+        self.prices = pd.concat([self.prices, new_prices], ignore_index=True)
+        self._yearly = pd.concat([self._yearly, self._derive_yearly(new, new_prices)]).sort_index()
+        self._county = pd.concat([self._county, self._derive_county(new, new_prices)]).sort_index()
+
+    @staticmethod
+    def _derive_yearly(aggregates, prices) -> pd.DataFrame:
+        by_type = _indices(aggregates, prices, ["year", "land_type"]).unstack("land_type")
+        overall = _indices(aggregates, prices, ["year"])
+        columns = {}
+        for land_type, prefix in LAND_TYPES.items():
+            for measure in ("avg_eur", "weighted_eur", "median_eur"):
+                if (measure, land_type) in by_type:
+                    columns[f"{prefix}_{measure}"] = by_type[(measure, land_type)]
+        for measure in ("avg_eur", "weighted_eur", "median_eur", "volume_eur", "number"):
+            columns[f"all_{measure}"] = overall[measure]
+        return pd.DataFrame(columns)
+
+    @staticmethod
+    def _derive_county(aggregates, prices) -> pd.DataFrame:
+        return _indices(aggregates, prices, KEYS)
+
+    def yearly(self) -> pd.DataFrame:
+        return self._yearly.reset_index()
+
+    def by_county(self) -> pd.DataFrame:
+        return self._county.reset_index()
+
+    def total_land_index(self) -> pd.DataFrame:
+        """The yearly table in the format of data/total_land_index.csv."""
+        return self.yearly()[["year"] + list(TOTAL_INDEX_COLUMNS)].rename(columns=TOTAL_INDEX_COLUMNS)
+
+    def save(self, state_dir: str = STATE_DIR):
+        write_binary(self.aggregates.reset_index(), os.path.join(state_dir, "aggregates.feather"))
+        write_binary(self.prices, os.path.join(state_dir, "prices.feather"))
+
+    @classmethod
+    def load(cls, state_dir: str = STATE_DIR):
+        aggregates = read_binary(os.path.join(state_dir, "aggregates.feather"))
+        prices = read_binary(os.path.join(state_dir, "prices.feather"))
+        if aggregates is None or prices is None:
+            return None
+        return cls(aggregates.set_index(KEYS), prices)
+
+
+def write_outputs(index: LandIndex):
+    index.total_land_index().to_csv(TOTAL_INDEX_PATH, index=False)
+    index.by_county().to_csv(COUNTY_INDEX_PATH, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the land price indices from the raw Maa-amet rows.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="recompute all years from the raw dataset")
+    build.add_argument("source", nargs="?", help="raw CSV (default: the registry's Maa-amet dataset)")
+    append = subparsers.add_parser("append", help="add a new year's raw rows to the existing index")
+    append.add_argument("source", help="CSV with the new rows, in the Maa-amet format")
+    parser.add_argument("--state-dir", default=STATE_DIR)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        index = LandIndex.from_rows(read_raw(args.source))
+    else:
+        index = LandIndex.load(args.state_dir) or LandIndex.from_rows(read_raw())
+        try:
+            index.append(read_raw(args.source))
+        except ValueError as e:
+            parser.error(str(e))
+    index.save(args.state_dir)
+    write_outputs(index)
+    print(f"indexed years {index.years[0]}-{index.years[-1]}: wrote {TOTAL_INDEX_PATH} and {COUNTY_INDEX_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+
+# Timing of page sections, data loads, model fits and figure builds.
+#
+#   LANDEX_INSTRUMENT=1          record wall and CPU time (shown by render_debug_panel)
+#   LANDEX_INSTRUMENT=memory     also record allocation deltas via tracemalloc
+#
+# CPU time is that of the thread running the span, i.e. of one session. The
+# allocation delta is process-wide: with several sessions running at once it
+# includes their allocations too, so it is only exact for one session at a time
+# (as in the benchmarks).
+#   LANDEX_INSTRUMENT_LOG=path   append every record to `path` as a JSON line
+#
+# With none of these set, measure() hands out a shared no-op context manager
+# and decorated functions are left unwrapped.
+MODE = os.environ.get("LANDEX_INSTRUMENT", "").lower()
+LOG_PATH = os.environ.get("LANDEX_INSTRUMENT_LOG")
+ENABLED = bool(MODE and MODE != "0") or bool(LOG_PATH)
+TRACE_MEMORY = MODE == "memory"
+
+_records = deque(maxlen=1000)
+_log_lock = threading.Lock()
+
+if TRACE_MEMORY and not tracemalloc.is_tracing():
+    tracemalloc.start()
+
+
+class _NoMeasurement:
+
+    rows = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **fields):
+        pass
+
+
+_NO_MEASUREMENT = _NoMeasurement()
+
+
+class _Measurement:
+
+    def __init__(self, name, rows=None, **fields):
+        self.name = name
+        self.rows = rows
+        self.fields = fields
+
+    def __enter__(self):
+        if TRACE_MEMORY:
+            self._memory = tracemalloc.get_traced_memory()[0]
+        self._cpu = time.thread_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def set(self, **fields):
+        """Add fields known only inside the span, e.g. the size of what it produced."""
+        self.fields.update(fields)
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall
+        cpu = time.thread_time() - self._cpu
+        # The first extra field (section, dataset, ...) tells spans of one name apart
+        label = f"{self.name}:{next(iter(self.fields.values()))}" if self.fields else self.name
+        record = {
+            "name": self.name,
+            "label": label,
+            "time": time.time(),
+            "wall_ms": round(wall * 1000, 3),
+            "cpu_ms": round(cpu * 1000, 3),
+            "rows": self.rows,
+            "error": exc_type.__name__ if exc_type else None,
+            **self.fields,
+        }
+        if TRACE_MEMORY:
+            record["alloc_kib"] = round((tracemalloc.get_traced_memory()[0] - self._memory) / 1024, 1)
+        _records.append(record)
+        if LOG_PATH:
+            line = json.dumps(record, default=str)
+            with _log_lock, open(LOG_PATH, "a") as f:
+                f.write(line + "\n")
+        return False
+
+
+def measure(name: str, rows: int = None, **fields):
+    """Context manager recording one timed span; set `.rows` on it to report rows processed."""
+    if not ENABLED:
+        return _NO_MEASUREMENT
+    return _Measurement(name, rows, **fields)
+
+
+def measured(name: str):
+    """Decorator form of measure(); a no-op when instrumentation is disabled."""
+    def decorate(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Measurement(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def records() -> list:
+    return list(_records)
+
+
+def render_debug_panel():
+    """Summarise the recorded spans in a sidebar expander, when instrumentation is on."""
+    if not ENABLED or not _records:
+        return
+    import pandas as pd
+    import streamlit as st
+
+    df = pd.DataFrame(records())
+    columns = {"wall_ms": ["count", "mean", "max"], "cpu_ms": ["mean"]}
+    for column in ("alloc_kib", "payload_kib"):
+        if column in df:
+            columns[column] = ["mean"]
+    summary = df.groupby("label").agg(columns)
+    summary.columns = [" ".join(column) for column in summary.columns]
+    with st.sidebar.expander("Debug: timings"):
+        st.dataframe(summary.sort_values("wall_ms mean", ascending=False))
+        if "alloc_kib" in df:
+            st.caption("cpu_ms is per session thread; alloc_kib is process-wide and includes "
+                       "what concurrent sessions allocated meanwhile.")
@@ -0,0 +1,271 @@
+import copy
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+import streamlit as st
+
+from Backtest import accuracy_table
+from ChartData import bin_scatter, downsample_series, render_mode
+from DataRegistry import get_dataset
+from DataWatcher import start_watcher
+from FigureCache import cached_figure
+from ForecastEngine import FORECAST_UNCERTAINTY, load_forecast
+from Instrumentation import measure, render_debug_panel
+from PageText import TEXT
+from QueryLayer import COUNTY_YEAR, land_query
+from StreamlitHelper import Toc, anchor, create_paragraph
+
+# Both language pages are rendered from SECTIONS below. Data, tables and figures
+# are keyed by section and dataset version, so the EN and EE pages share them;
+# only the text from PageText differs.
+#
+# The body of every section (figure, table or forecast) is a Streamlit fragment,
+# so an interaction inside one section reruns only that section. Sections marked
+# `lazy` - the forecasts, which most visitors never scroll to - stay collapsed
+# behind a toggle and compute nothing until it is switched on. Prophet (and
+# through it cmdstanpy and matplotlib) is therefore only imported once a
+# forecast is opened.
+#
+# warm_up() computes all of it ahead of the readers: at server start and, through
+# DataWatcher, for every new version of a data file before it is served.
+
+# inject CSS to hide row indexes and style fullscreen button
+STYLE_CSS = """
+            <style>
+            /*style hide table row index*/
+            thead tr th:first-child {display:none}
+            tbody th {display:none}
+
+            /*style fullscreen button*/
+            button[title="View fullscreen"] {
+                background-color: #004170cc;
+                right: 0;
+                color: white;
+            }
+            button[title="View fullscreen"]:hover {
+                background-color:  #004170;
+                color: white;
+                }
+            a { text-decoration:none;}
+            </style>
+            """
+
+MARGIN = dict(l=5, r=5, t=5, b=5)
+
+
+# FIGURES - each takes the section's dataset and its localised text. Charts of
+# individual rows go through ChartData, which bounds the points sent to the
+# browser and switches large scatters to WebGL.
+
+def volume_bar(df, text):
+    fig = px.bar(df, x='year', y='total_volume_eur',
+                 hover_data=['year', 'avg_price_eur', 'total_volume_eur', 'county', 'region'], color='land_type',
+                 labels={'avg_price_eur':'Average price (EUR per hectar)'}, height=400)
+    fig.update_layout(margin=MARGIN)
+    return fig
+
+def price_treemap(df, text):
+    fig = px.treemap(df, path=['land_type', 'county', 'region'], values='total_volume_eur',
+                     color='avg_price_eur', hover_data=['region'],
+                     color_continuous_scale='RdBu',
+                     color_continuous_midpoint=np.average(df['avg_price_eur'], weights=df['total_volume_eur']))
+    fig.update_layout(margin=MARGIN)
+    return fig
+
+def price_vs_area(df, text):
+    points = bin_scatter(df, "average_area", "avg_price_eur", by="county", size="total_volume_eur")
+    fig = px.scatter(points, x="average_area", y="avg_price_eur", color="county",
+                     size='total_volume_eur', hover_data=['region' if 'region' in points else 'rows'],
+                     render_mode=render_mode(len(points)))
+    fig.update_layout(margin=MARGIN)
+    return fig
+
+def area_vs_volume(df, text):
+    points = bin_scatter(df, "average_area", "total_volume_eur", by="land_type")
+    fig = px.scatter(points, x="average_area", y="total_volume_eur", color="land_type",
+                     render_mode=render_mode(len(points)))
+    fig.update_layout(
+        xaxis_title="Average Area (hectares)",
+        margin=MARGIN
+    )
+    return fig
+
+def _index_area(df, column, text, colors=None):
+    fig = px.area(df, x="year", y=column, color_discrete_sequence=colors)
+    fig.update_yaxes(title_text=text["yaxis"])
+    fig.update_xaxes(title_text=text["xaxis"])
+    return fig
+
+def forest_index(df, text):
+    return _index_area(df, "forest_avg_eur", text, ['green'])
+
+def farm_index(df, text):
+    return _index_area(df, "farmland_avg_eur", text, ['orange'])
+
+def total_index(df, text):
+    return _index_area(df, "all_average_eur", text)
+
+def county_volume(df, text):
+    index_df = downsample_series(county_volumes(df), "year", "total_volume_eur", by=["county", "land_type"])
+    return px.area(index_df, x="year", y="total_volume_eur", color="county", line_group="land_type")
+
+
+# TABLES
+
+# Mean transaction volume per land type, year and county, shared by the Land
+# Volume Index and Top performers sections; computed once per dataset version
+# by the query layer.
+def county_volumes(df):
+    return land_query(df).rollup(COUNTY_YEAR, "total_volume_eur", "mean")
+
+def top_performers(df):
+    return land_query(df).top(5, COUNTY_YEAR, "total_volume_eur", "mean")
+
+
+class Section:
+    """One block of the page: a heading plus a figure, table or forecast, and a paragraph.
+
+    `level` is the Toc heading level; sections with level None get a plain
+    subheader and no sidebar link. `localised` marks figures that contain text,
+    which are cached per language instead of shared. `lazy` sections render
+    their content only after the reader switches it on. `uncertainty` is the
+    forecast interval mode (see ForecastEngine.UNCERTAINTY_MODES).
+    """
+
+    def __init__(self, key, dataset=None, figure=None, table=None, forecast=None,
+                 level="subheader", localised=False, lazy=False, uncertainty=FORECAST_UNCERTAINTY):
+        self.key = key
+        self.dataset = dataset
+        self.figure = figure
+        self.table = table
+        self.forecast = forecast
+        self.level = level
+        self.localised = localised
+        self.lazy = lazy
+        self.uncertainty = uncertainty
+
+    @property
+    def has_body(self):
+        return self.figure is not None or self.table is not None or self.forecast is not None
+
+
+ESTONIA = "maaamet_farm_forest_2022"
+INDEX = "total_land_index"
+
+SECTIONS = [
+    Section("overview", level="header"),
+    Section("volume_bar", ESTONIA, figure=volume_bar),
+    Section("price_treemap", ESTONIA, figure=price_treemap),
+    Section("price_vs_area", ESTONIA, figure=price_vs_area),
+    Section("area_vs_volume", ESTONIA, figure=area_vs_volume),
+    Section("forest_index", INDEX, figure=forest_index, localised=True),
+    Section("farm_index", INDEX, figure=farm_index, localised=True),
+    Section("total_index", INDEX, figure=total_index, localised=True),
+    Section("county_volume", ESTONIA, figure=county_volume),
+    Section("top_performers", ESTONIA, table=top_performers),
+    Section("land_price_prediction"),
+    Section("forest_forecast", forecast="forest", level=None, lazy=True),
+    Section("farmland_forecast", forecast="farmland", level=None, lazy=True),
+    Section("farm_forest_forecast", forecast="farm_forest", level=None, lazy=True),
+]
+
+
+def forecast_figures(name, uncertainty=FORECAST_UNCERTAINTY):
+    """The forecast plot (with its interval) and the forecast line of a series."""
+    m, forecast = load_forecast(name, uncertainty=uncertainty)
+    def build_forecast_plot():
+        from prophet.plot import plot_plotly
+        model = m
+        if not m.uncertainty_samples and "yhat_lower" in forecast:
+            # plot_plotly only draws the band of sampling models; show the analytic one too
+            model = copy.copy(m)
+            model.uncertainty_samples = 1
+        return plot_plotly(model, forecast)
+    def build_forecast_line():
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=forecast['ds'], y=forecast['yhat'], mode='lines', name='Forecast'))
+        return fig
+    return (cached_figure('forecast_plot', build_forecast_plot, forecast),
+            cached_figure('forecast_line', build_forecast_line, forecast))
+
+
+def render_forecast(name, uncertainty=FORECAST_UNCERTAINTY):
+    fig1, fig = forecast_figures(name, uncertainty)
+    st.plotly_chart(fig1)
+    st.plotly_chart(fig, use_container_width=True)
+
+
+def section_figure(section, locale, df):
+    text = TEXT[locale]["sections"][section.key]
+    return cached_figure(section.key, lambda: section.figure(df, text), df,
+                         lang=locale if section.localised else None)
+
+
+@st.fragment
+def render_section_body(section, locale):
+    with measure("section", section=section.key, locale=locale):
+        page = TEXT[locale]
+        if section.lazy and not st.toggle(page["show_forecast"], key=f"show-{section.key}"):
+            return
+        df = get_dataset(section.dataset) if section.dataset else None
+        if section.figure is not None:
+            st.plotly_chart(section_figure(section, locale, df), use_container_width=True)
+        if section.table is not None:
+            st.table(section.table(df))
+        if section.forecast is not None:
+            render_forecast(section.forecast, section.uncertainty)
+            st.caption(page["forecast_accuracy"])
+            st.table(accuracy_table(section.forecast))
+
+
+def render_section(section, locale, toc):
+    page = TEXT[locale]
+    text = page["sections"][section.key]
+    if section.level is None:
+        st.subheader(text["title"])
+    else:
+        link = f"<a href='./{page['page']}#{anchor(text['title'])}' target='_self'>{text['sidebar']}</a>"
+        st.sidebar.markdown(link, unsafe_allow_html=True)
+        getattr(toc, section.level)(text["title"])
+
+    if section.has_body:
+        render_section_body(section, locale)
+    if "paragraph" in text:
+        create_paragraph(text["paragraph"])
+
+
+def warm_up(locales=tuple(TEXT)):
+    """Compute every figure, table and forecast of the pages for the served data versions."""
+    for locale in locales:
+        for section in SECTIONS:
+            if not section.has_body:
+                continue
+            with measure("warm_up", section=section.key, locale=locale):
+                df = get_dataset(section.dataset) if section.dataset else None
+                if section.figure is not None:
+                    section_figure(section, locale, df)
+                if section.table is not None:
+                    section.table(df)
+                if section.forecast is not None:
+                    forecast_figures(section.forecast, section.uncertainty)
+                    accuracy_table(section.forecast)
+
+
+def render_page(locale: str):
+    # Warms the pages at start and whenever a data file changes (see DataWatcher)
+    start_watcher([warm_up])
+    st.set_page_config(
+        page_title="Land Index",
+        page_icon="data/landex.ico",
+    )
+    st.markdown(STYLE_CSS, unsafe_allow_html=True)
+    toc = Toc()
+
+    # TITLE
+    st.image("data/landex.png", width=200)
+    st.title(TEXT[locale]["title"])
+
+    for section in SECTIONS:
+        render_section(section, locale, toc)
+    render_debug_panel()
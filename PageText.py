@@ -0,0 +1,206 @@
+# Localised text of the index pages, keyed by locale and then by section key
+# (see PageEngine.SECTIONS). Everything else about a section is shared.
+TEXT = {
+    "en": {
+        "page": "Estonian_Index_-_EN",
+        "title": "Estonian Land Index",
+        "show_forecast": "Show forecast",
+        "forecast_accuracy": "Backtest accuracy - mean error of forecasts 1 to 4 years ahead, made from every past year with at least 8 years of history (EUR per hectare)",
+        "sections": {
+            "overview": {
+                "sidebar": "Overview",
+                "title": "Overview",
+                "paragraph": '''LandEx is a startup company based in Tallinn, Estonia, with a mission to democratize land investment.
+
+They believe that land is a great asset class that provides high-yield and low-risk returns due to its economic fundamentals, and therefore it should be accessible to anyone.
+
+The company aims to become the largest land investment platform in Europe, providing a solution that was not previously available in the market.
+The founders of LandEx, Kamel, and Randy, were dissatisfied with the investment opportunities available for land investments. They found it challenging to source and manage land, and the minimum investment required was often in the thousands of euros, making it difficult for many people to access this type of investment.
+As a result, they created a digital platform to provide everyone with the opportunity to invest in land, which they launched in September 2021.
+LandEx is the first crowdfunding land investment platform in Europe, offering investors an opportunity to invest in land projects with a low minimum investment.
+
+The platform enables investors to browse a range of investment opportunities, choose the projects they want to invest in, and invest in just a few clicks. LandEx also provides investors full transparency and control over their investments, including tracking the progress of the projects in real time.
+
+With LandEx's innovative and user-friendly platform, investing in the land has never been more accessible. The company's mission to democratize land investment is an exciting development for those interested in investing in this asset class, providing a low-risk and high-yield investment option that was previously inaccessible to many.''',
+            },
+            "volume_bar": {
+                "sidebar": "Historical Sales Volume by Land Type",
+                "title": "Figure - Historical Sales Volume by Land Type",
+                "paragraph": '''The Land Index provides an overview of the fluctuations in the prices of farmland and forest land.
+It's noteworthy that these prices have experienced a noticeable increase in recent years.''',
+            },
+            "price_treemap": {
+                "sidebar": "Relative price of land by region - point of time data (2022)",
+                "title": "Figure - Relative price of land by region - point of time data (2022)",
+                "paragraph": '''Based on the data available up until 2022, we can observe the following trends:
+
+Price Range - The prices for land in Hiiumaa, a remote island in Estonia, ranged from around 2400 EUR per hectare at the lower end to some of the highest prices.
+
+Land Type - On average, forest land was more expensive than farmland.
+
+These observations provide valuable insights into the current state of the land market and can help inform decision-making for those looking to buy or sell land.''',
+            },
+            "price_vs_area": {
+                "sidebar": "Average price vs average plot size",
+                "title": "Figure - Average price vs average plot size",
+                "paragraph": '''The provided graph visualizes the relationship between two variables, average_area, and avg_price_eur, for various counties within a given region. Each point on the graph represents a county, with the color of the point indicating the specific county and the size of the point representing the total sales volume in euros.
+
+As we move from the top left to the bottom right, we can see a downward trend in the points, indicating that larger plots tend to have lower average prices and smaller plots tend to have higher average prices.''',
+            },
+            "area_vs_volume": {
+                "sidebar": "Relationship between Land Area and Transaction Volume",
+                "title": "Figure - Relationship between Land Area and Transaction Volume",
+                "paragraph": '''The largest number of transactions were for plots that were approximately 10 hectares in size.
+''',
+            },
+            "forest_index": {
+                "sidebar": "Forest land Index",
+                "title": "Figure - Forest land Index",
+                "paragraph": '''The average price of forest land grew from about 1,000 EUR per hectare in 2000 to about 8,000 EUR per hectare in 2022.
+''',
+                "yaxis": "The average price in EUR per hectare, forest land",
+                "xaxis": "Year",
+            },
+            "farm_index": {
+                "sidebar": "Farmland Index",
+                "title": "Figure - Farmland Index",
+                "paragraph": '''The average price of forest land grew from about 280 EUR per hectare in 2000 to about 4,800 EUR per hectare in 2022.
+''',
+                "yaxis": "The average price in EUR per hectare, farmland",
+                "xaxis": "Year",
+            },
+            "total_index": {
+                "sidebar": "Farmland and Forest Land Total Index",
+                "title": "Figure - Farmland and Forest Land Total Index",
+                "paragraph": '''The average price of forest land grew from about 730 EUR per hectare in 2000 to about 6,600 EUR per hectare in 2022.
+''',
+                "yaxis": "The average price in EUR per hectare, Farmland and Forest Land",
+                "xaxis": "Year",
+            },
+            "county_volume": {
+                "sidebar": "Land Volume Index",
+                "title": "Figure -Land Volume Index",
+                "paragraph": '''The total volume of transactions of all lands grew from about 4 million EUR in 2000 to about 58m EUR in 2022.
+''',
+            },
+            "top_performers": {
+                "sidebar": "Top performers - Price Performance (County)",
+                "title": "Top performers - Price Performance (County)",
+            },
+            "land_price_prediction": {
+                "sidebar": "Land Price Prediction",
+                "title": "Land Price Prediction",
+            },
+            "forest_forecast": {
+                "title": "Estonia Forest Land Prophet Model - Estonian Forest Land Prediction",
+            },
+            "farmland_forecast": {
+                "title": "Estonia Farmland Prophet Model - Estonian Farmland Prediction",
+            },
+            "farm_forest_forecast": {
+                "title": "Estonia Forest land and Farmland Prophet Model - Estonian Forest Land and Farmland Prediction",
+            },
+        },
+    },
+    "ee": {
+        "page": "Estonian_Index_-_EE",
+        "title": "Eesti maaindeks",
+        "show_forecast": "Näita prognoosi",
+        "forecast_accuracy": "Prognoosi täpsus - 1 kuni 4 aasta prognooside keskmine viga, tehtud igast varasemast aastast, millele eelneb vähemalt 8 aastat andmeid (EUR hektari kohta)",
+        "sections": {
+            "overview": {
+                "sidebar": "Ülevaade",
+                "title": "Ülevaade",
+                "paragraph": '''LandEx on Tallinnas asuv idufirma, mille eesmärk on demokratiseerida maainvesteeringuid.
+
+Nad usuvad, et maa on suurepärane varaklass, mis pakub oma majanduslike põhialuste tõttu kõrget tootlust ja madalat riski ning seetõttu peaks see olema kõigile kättesaadav.
+
+Ettevõtte eesmärk on saada suurimaks maainvesteeringute platvormiks Euroopas, pakkudes lahendust, mida varem turul ei olnud võimalik saada.
+LandExi asutajad Kamel ja Randy olid rahulolematud maainvesteeringute investeerimisvõimalustega. Nad leidsid, et maa leidmine ja haldamine on keeruline ning nõutav minimaalne investeering on sageli tuhandetes eurodes, mistõttu on paljudel inimestel raske seda liiki investeeringutele ligi pääseda.
+Selle tulemusena lõid nad digitaalse platvormi, et pakkuda kõigile võimalust investeerida maasse, mille nad käivitasid 2021. aasta septembris.
+LandEx on esimene ühisrahastuse maainvesteeringute platvorm Euroopas, mis pakub investoritele võimalust investeerida maaprojektidesse madala minimaalse investeeringuga.
+
+Platvorm võimaldab investoritel sirvida erinevaid investeerimisvõimalusi, valida projektid, millesse nad soovivad investeerida, ja investeerida vaid paari klikiga. LandEx pakub investoritele ka täielikku läbipaistvust ja kontrolli oma investeeringute üle, sealhulgas projektide edenemise jälgimist reaalajas.
+
+LandExi uuendusliku ja kasutajasõbraliku platvormi abil ei ole maasse investeerimine kunagi varem olnud kättesaadavam. Ettevõtte missioon demokratiseerida maainvesteeringuid on põnev areng neile, kes on huvitatud sellesse varaklassi investeerimisest, pakkudes madala riskiga ja kõrge tootlusega investeerimisvõimalust, mis varem oli paljudele kättesaamatu.''',
+            },
+            "volume_bar": {
+                "sidebar": "Ajalooline müügimaht maatüüpide kaupa",
+                "title": "Joonis - ajalooline müügimaht maatüüpide kaupa",
+                "paragraph": '''Maaindeks annab ülevaate põllu- ja metsamaa hinna kõikumisest.
+Tähelepanuväärne on, et need hinnad on viimastel aastatel märgatavalt tõusnud.''',
+            },
+            "price_treemap": {
+                "sidebar": "Maa suhteline hind piirkonniti - ajahetke andmed (2022)",
+                "title": "Joonis - Maa suhteline hind piirkonniti - hetkeandmed (2022)",
+                "paragraph": '''Kuni 2022. aastani kättesaadavate andmete põhjal võib täheldada järgmisi suundumusi:
+
+Hinnavahemik - Hiiumaal, Eesti kaugel asuval saarel asuva maa hinnad ulatusid umbes 2400 eurost hektari kohta alumisest otsast kuni mõne kõrgeima hinnani.
+
+Maatüüp - Keskmiselt oli metsamaa kallim kui põllumaa.
+
+Need tähelepanekud annavad väärtusliku ülevaate maaturu praegusest olukorrast ja võivad aidata otsuste tegemisel neile, kes soovivad maad osta või müüa.''',
+            },
+            "price_vs_area": {
+                "sidebar": "Keskmine hind vs. keskmine maatüki suurus",
+                "title": "Joonis - Keskmine hind vs. keskmine maatüki suurus",
+                "paragraph": '''Esitatud graafik visualiseerib kahe muutuja, keskmine_pindala ja keskmine_hind_eur, vahelist seost erinevate maakondade kohta antud piirkonnas. Iga punkt graafikul tähistab maakonda, kusjuures punkti värv näitab konkreetset maakonda ja punkti suurus tähistab müügi kogumahtu eurodes.
+
+Liikudes vasakult ülevalt paremale allapoole, näeme punktide langustendentsi, mis näitab, et suuremate maatükkide keskmine hind on pigem madalam ja väiksemate maatükkide keskmine hind on pigem kõrgem.''',
+            },
+            "area_vs_volume": {
+                "sidebar": "Maa-ala ja tehingumahu vaheline seos",
+                "title": "Joonis - Maa-ala ja tehingumahu vaheline seos",
+                "paragraph": '''Kõige rohkem tehinguid tehti ligikaudu 10 hektari suuruste maatükkidega.
+''',
+            },
+            "forest_index": {
+                "sidebar": "Metsamaa indeks",
+                "title": "Joonis - Metsamaa indeks",
+                "paragraph": '''Metsamaa keskmine hind kasvas umbes 1000 eurolt hektari kohta 2000. aastal umbes 8000 euroni hektari kohta 2022. aastal.
+''',
+                "yaxis": "Keskmine hind eurodes hektari kohta, metsamaa",
+                "xaxis": "Aasta",
+            },
+            "farm_index": {
+                "sidebar": "põllumajandusmaa indeks",
+                "title": "Joonis - põllumajandusmaa indeks",
+                "paragraph": '''Metsamaa keskmine hind kasvas umbes 280 eurolt hektari kohta 2000. aastal umbes 4800 euroni hektari kohta 2022. aastal.
+''',
+                "yaxis": "Keskmine hind eurodes hektari kohta, põllumajandusmaa",
+                "xaxis": "Aasta",
+            },
+            "total_index": {
+                "sidebar": "Põllu- ja metsamaa Koguindeks",
+                "title": "Joonis - Põllu- ja metsamaa koguindeks",
+                "paragraph": '''Metsamaa keskmine hind kasvas umbes 730 eurolt hektari kohta 2000. aastal umbes 6600 euroni hektari kohta 2022. aastal.
+''',
+                "yaxis": "Keskmine hind eurodes hektari kohta, põllu- ja metsamaa",
+                "xaxis": "Aasta",
+            },
+            "county_volume": {
+                "sidebar": "Maa mahuindeks",
+                "title": "Joonis - Maa mahuindeks",
+                "paragraph": '''Kõigi maade tehingute kogumaht kasvas umbes 4 miljonilt eurolt 2000. aastal umbes 58 miljoni euroni 2022. aastal.
+''',
+            },
+            "top_performers": {
+                "sidebar": "Tipptegijad - Hinnatulemused (maakond)",
+                "title": "Tipptegijad - Hinnatulemused (maakond)",
+            },
+            "land_price_prediction": {
+                "sidebar": "Maa hinna prognoosimine",
+                "title": "Maa hinna prognoosimine",
+            },
+            "forest_forecast": {
+                "title": "Eesti metsamaa prohveti mudel - Eesti metsamaa prognoosimine",
+            },
+            "farmland_forecast": {
+                "title": "Eesti põllumaa prohveti mudel - Eesti põllumaa prognoosimine",
+            },
+            "farm_forest_forecast": {
+                "title": "Eesti metsamaa ja põllumaa prohveti mudel - Eesti metsamaa ja põllumaa prognoosimine",
+            },
+        },
+    },
+}
@@ -0,0 +1,99 @@
+import threading
+
+import pandas as pd
+
+from CacheLayer import keyed_cache
+from DataRegistry import dataset_version
+from Instrumentation import measure
+
+# Indexed access to the Maa-amet rows for the pages, the query service and
+# interactive filters. A LandQuery sorts the rows once on a MultiIndex
+# (land_type, county, region, year), so a slice is an index lookup instead of
+# a scan, and keeps each rollup (e.g. mean volume per land type, year and
+# county) after computing it once. One LandQuery is built per dataset version.
+LEVELS = ["land_type", "county", "region", "year"]
+COUNTY_YEAR = ("land_type", "year", "county")
+
+_queries = keyed_cache("QueryLayer.queries", max_entries=20)
+
+
+def _selector(value, labels: pd.Index):
+    if value is None:
+        return slice(None)
+    if isinstance(value, tuple):  # an inclusive (start, stop) range, e.g. of years
+        return slice(*value)
+    if isinstance(value, (list, set, pd.Index, pd.Series)):
+        # Labels that do not occur select nothing rather than failing the whole lookup
+        return [label for label in value if label in labels]
+    return value
+
+
+class _Indexed:
+    # Rows sorted by `levels`, kept both as plain columns (what callers get back)
+    # and as a MultiIndex over the same order, which turns a filter into row positions.
+
+    def __init__(self, rows: pd.DataFrame, levels):
+        self.levels = list(levels)
+        self.rows = rows.sort_values(self.levels, ignore_index=True)
+        self.index = pd.MultiIndex.from_frame(self.rows[self.levels]).remove_unused_levels()
+
+    def select(self, filters: dict) -> pd.DataFrame:
+        unknown = set(filters) - set(self.levels)
+        if unknown:
+            raise KeyError(f"cannot filter on {', '.join(sorted(unknown))}; levels are {', '.join(self.levels)}")
+        if not filters:
+            return self.rows.copy(deep=False)
+        key = tuple(_selector(filters.get(level), labels) for level, labels in zip(self.levels, self.index.levels))
+        if any(isinstance(selector, list) and not selector for selector in key):
+            return self.rows.iloc[:0]
+        try:
+            positions = self.index.get_locs(key)
+        except KeyError:  # a label that does not occur selects nothing
+            return self.rows.iloc[:0]
+        return self.rows.take(positions).reset_index(drop=True)
+
+
+class LandQuery:
+    """Slices, rollups and top-N lists over one version of a Maa-amet dataset."""
+
+    def __init__(self, df: pd.DataFrame):
+        with measure("query_index", rows=len(df)):
+            self._rows = _Indexed(df, LEVELS)
+        self._rollups = {}
+        self._lock = threading.Lock()
+
+    def slice(self, **filters) -> pd.DataFrame:
+        """Rows matching `filters` on the index levels.
+
+        A filter value is a label, a list of labels or a (start, stop) tuple,
+        e.g. `slice(land_type="Farmland", year=(2010, 2020))`.
+        """
+        return self._rows.select(filters)
+
+    def rollup(self, levels=COUNTY_YEAR, column: str = "total_volume_eur", how: str = "mean",
+               **filters) -> pd.DataFrame:
+        """`column` aggregated with `how` per `levels`, sorted by them, optionally filtered."""
+        key = (tuple(levels), column, how)
+        table = self._rollups.get(key)
+        if table is None:
+            with self._lock:
+                table = self._rollups.get(key)
+                if table is None:
+                    rows = self._rows.rows
+                    grouped = rows.groupby(list(levels), observed=True)[column].agg(how).reset_index()
+                    table = _Indexed(grouped, levels)
+                    self._rollups[key] = table
+        return table.select(filters)
+
+    def top(self, n: int = 5, levels=COUNTY_YEAR, column: str = "total_volume_eur", how: str = "mean",
+            **filters) -> pd.DataFrame:
+        """The `n` largest rollup rows, largest first."""
+        return self.rollup(levels, column, how, **filters).nlargest(n, column)
+
+
+def land_query(df: pd.DataFrame) -> LandQuery:
+    """The LandQuery of a registry dataset view (shared per version), or a new one for any other frame."""
+    version = dataset_version(df)
+    if version is None:
+        return LandQuery(df)
+    return _queries.get_or_compute(version, lambda: LandQuery(df))
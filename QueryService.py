@@ -0,0 +1,289 @@
+import argparse
+import json
+import logging
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import pandas as pd
+
+from ArtifactStore import content_key, shared_frame
+from CacheLayer import cache_stats, keyed_cache, resource_cache
+from DataRegistry import dataset_fingerprint, get_dataset
+from DataWatcher import start_watcher
+from ForecastEngine import (FORECAST_SERIES, FORECAST_UNCERTAINTY, UNCERTAINTY_MODES, fit_forecast, load_forecast,
+                            prepare_series)
+from HedonicIndex import EFFECTS, WEIGHTS, hedonic_index
+from IndexBuilder import LandIndex
+from Instrumentation import measure
+from QueryLayer import land_query
+
+# JSON API over the numbers the index pages show, for tools that cannot run the
+# Streamlit script:
+#
+#   GET  /index                          yearly index as on the pages (total_land_index.csv)
+#   GET  /index/yearly                   mean, volume-weighted and median yearly indices
+#   GET  /index/county?county=&land_type=
+#   GET  /index/hedonic?weights=&by=     quality-adjusted index (see HedonicIndex)
+#   GET  /top-performers?n=&land_type=&year=
+#   GET  /forecast?series=forest|farmland|farm_forest&uncertainty=
+#   GET  /forecast/group?land_type=&county=&uncertainty=
+#   POST /batch                          {"requests": [{"path": ..., "params": {...}}, ...]}
+#
+# Datasets, indices and fitted models stay loaded in this process (the caches
+# of DataRegistry, CacheLayer and ForecastEngine), and every response body is
+# cached by path, parameters and the fingerprints of the data files it was
+# computed from, so a repeated query is a dictionary lookup. DataWatcher swaps in
+# changed data files only after the default queries have been answered for them.
+ESTONIA = "maaamet_farm_forest_2022"
+INDEX = "total_land_index"
+
+logger = logging.getLogger(__name__)
+
+_responses = keyed_cache("QueryService.responses", max_entries=2000)
+ENDPOINTS = {}
+FORECAST_COLUMNS = ["ds", "yhat", "yhat_lower", "yhat_upper"]
+
+
+class QueryError(ValueError):
+    """A bad request; reported to the client with status 400."""
+
+
+class UnknownPath(LookupError):
+    """A path no endpoint serves; reported with status 404."""
+
+
+def endpoint(path: str, datasets):
+    """Register a handler `func(params) -> DataFrame` computed from `datasets`."""
+    def register(func):
+        ENDPOINTS[path] = (func, datasets)
+        return func
+    return register
+
+
+def _choice(params: dict, name: str, choices, default=None):
+    value = params.get(name, default)
+    if value is not None and value not in choices:
+        raise QueryError(f"{name} must be one of {', '.join(map(str, choices))}")
+    return value
+
+
+def _int(params: dict, name: str, default=None):
+    try:
+        return int(params[name]) if name in params else default
+    except ValueError:
+        raise QueryError(f"{name} must be an integer") from None
+
+
+def _where(df: pd.DataFrame, params: dict, columns) -> pd.DataFrame:
+    for column in columns:
+        if column in params:
+            df = df[df[column].astype(str) == params[column]]
+    return df
+
+
+def _uncertainty(params: dict) -> str:
+    return _choice(params, "uncertainty", list(UNCERTAINTY_MODES), FORECAST_UNCERTAINTY)
+
+
+@resource_cache(max_entries=10)
+def _land_index(digest: str) -> LandIndex:
+    # From the version the registry serves (the one `digest` names), not the file,
+    # which DataWatcher may not have published yet. The registry keeps prices as
+    # float32; their shortest repr is the CSV's value (up to 7 significant digits),
+    # so the index equals the one IndexBuilder.read_raw gives.
+    rows = get_dataset(ESTONIA)
+    prices = rows["avg_price_eur"].astype(str).astype("float64")
+    return LandIndex.from_rows(rows.assign(avg_price_eur=prices))
+
+
+@endpoint("/index", [INDEX])
+def index_series(params):
+    return get_dataset(INDEX)
+
+
+def _index_table(table: str) -> pd.DataFrame:
+    # "yearly" or "by_county" of the LandIndex, shared with the other processes
+    digest = dataset_fingerprint(ESTONIA)
+    return shared_frame("indices", content_key("land_index", table, digest),
+                        lambda: getattr(_land_index(digest), table)())
+
+
+@endpoint("/index/yearly", [ESTONIA])
+def yearly_index(params):
+    return _index_table("yearly")
+
+
+@endpoint("/index/county", [ESTONIA])
+def county_index(params):
+    return _where(_index_table("by_county"), params, ["county", "land_type", "year"])
+
+
+@endpoint("/index/hedonic", [ESTONIA])
+def hedonic(params):
+    weights = _choice(params, "weights", WEIGHTS + ("none",), "number")
+    by = _choice(params, "by", EFFECTS)
+    return hedonic_index(get_dataset(ESTONIA), None if weights == "none" else weights, by)
+
+
+@endpoint("/top-performers", [ESTONIA])
+def top_performers(params):
+    filters = {"land_type": params["land_type"]} if "land_type" in params else {}
+    if "year" in params:
+        filters["year"] = _int(params, "year")
+    return land_query(get_dataset(ESTONIA)).top(_int(params, "n", 5), **filters)
+
+
+@endpoint("/forecast", list(FORECAST_SERIES.values()))
+def forecast(params):
+    name = _choice(params, "series", list(FORECAST_SERIES), "farm_forest")
+    _, forecast = load_forecast(name, uncertainty=_uncertainty(params))
+    return forecast.reindex(columns=FORECAST_COLUMNS)
+
+
+@resource_cache(max_entries=100)
+def _group_forecast(land_type: str, county: str, uncertainty: str, digest: str):
+    df = _where(get_dataset(ESTONIA), {"land_type": land_type, "county": county}, ["land_type", "county"])
+    if df.empty:
+        raise QueryError(f"no rows for land_type={land_type!r}, county={county!r}")
+    _, forecast = fit_forecast(prepare_series(df), uncertainty=uncertainty)
+    return forecast.reindex(columns=FORECAST_COLUMNS)
+
+
+@endpoint("/forecast/group", [ESTONIA])
+def group_forecast(params):
+    if "land_type" not in params or "county" not in params:
+        raise QueryError("land_type and county are required")
+    return _group_forecast(params["land_type"], params["county"], _uncertainty(params),
+                           dataset_fingerprint(ESTONIA))
+
+
+def query(path: str, params: dict) -> bytes:
+    """The JSON body answering `path` with `params`, from the response cache when possible."""
+    if path not in ENDPOINTS:
+        raise UnknownPath(path)
+    handler, datasets = ENDPOINTS[path]
+    versions = tuple(dataset_fingerprint(name) for name in datasets)
+    key = (path, tuple(sorted(params.items())), versions)
+
+    def compute():
+        with measure("query", path=path) as m:
+            df = handler(params)
+            m.rows = len(df)
+            return df.to_json(orient="records", date_format="iso").encode()
+    return _responses.get_or_compute(key, compute)
+
+
+def batch(requests: list) -> bytes:
+    """Answer several queries at once; a failing query yields an {"error": ...} entry."""
+    bodies = []
+    for request in requests:
+        if not isinstance(request, dict):
+            bodies.append(json.dumps({"error": "each request must be an object with a path"}).encode())
+            continue
+        params = request.get("params", {})
+        if not isinstance(params, dict):
+            bodies.append(json.dumps({"error": "params must be an object"}).encode())
+            continue
+        try:
+            bodies.append(query(request.get("path"), {key: str(value) for key, value in params.items()}))
+        except UnknownPath:
+            bodies.append(json.dumps({"error": f"unknown path {request.get('path')!r}"}).encode())
+        except QueryError as e:
+            bodies.append(json.dumps({"error": str(e)}).encode())
+        except Exception as e:
+            # One failing query must not cost the others their answers
+            logger.exception("batch query %s failed", request.get("path"))
+            bodies.append(json.dumps({"error": f"internal error: {type(e).__name__}"}).encode())
+    return b"[" + b",".join(bodies) + b"]"
+
+
+def warm_up():
+    """Load every dataset and forecast, and answer each endpoint's default query once."""
+    for path in ENDPOINTS:
+        if path != "/forecast/group":
+            query(path, {})
+    for name in FORECAST_SERIES:
+        query("/forecast", {"series": name})
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; with Nagle's algorithm on, a kept-alive
+    # connection waits for the client's delayed ACK (~40ms) between them.
+    disable_nagle_algorithm = True
+    verbose = False
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/health":
+            return self._send(HTTPStatus.OK, json.dumps({"caches": cache_stats()}).encode())
+        self._answer(lambda: query(url.path, dict(parse_qsl(url.query))))
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/batch":
+            return self._error(HTTPStatus.NOT_FOUND, "POST is only supported on /batch")
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            requests = payload["requests"] if isinstance(payload, dict) else payload
+        except (ValueError, KeyError):
+            requests = None
+        if not isinstance(requests, list):
+            return self._error(HTTPStatus.BAD_REQUEST, 'expected {"requests": [...]}')
+        self._answer(lambda: batch(requests))
+
+    def _answer(self, respond):
+        try:
+            body = respond()
+        except UnknownPath:
+            return self._error(HTTPStatus.NOT_FOUND, f"unknown path; one of {', '.join(ENDPOINTS)}")
+        except QueryError as e:
+            return self._error(HTTPStatus.BAD_REQUEST, str(e))
+        except Exception as e:
+            # Answer instead of letting socketserver drop the connection
+            logger.exception("query %s failed", self.path)
+            return self._error(HTTPStatus.INTERNAL_SERVER_ERROR, f"internal error: {type(e).__name__}")
+        self._send(HTTPStatus.OK, body)
+
+    def _error(self, status, message):
+        self._send(status, json.dumps({"error": message}).encode())
+
+    def _send(self, status, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.verbose:
+            super().log_message(format, *args)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the land index and forecast numbers as JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    parser.add_argument("--no-warm", action="store_true", help="skip loading data and models at start")
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    if not args.no_warm:
+        warm_up()
+        # Refreshes the caches in the background when a data file changes
+        start_watcher([warm_up])
+    QueryHandler.verbose = args.verbose
+    server = ThreadingHTTPServer((args.host, args.port), QueryHandler)
+    print(f"serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,19 @@
 import streamlit as st
 import os
+import re
 import base64
 import pandas as pd
-import numpy as np
+from CacheLayer import data_cache
+from ColumnarCache import read_csv_cached
+
+CACHE_TTL = 60*60*24*7
+
+def anchor(text):
+    # Id of the element Toc places before a heading, for links to it
+    return re.sub('[^0-9a-zA-Z]+', '-', text).strip('-').lower()
+
+def create_paragraph(text):
+    st.markdown('<span style="word-wrap:break-word;">' + text + '</span>', unsafe_allow_html=True)
 
 # https://discuss.streamlit.io/t/table-of-contents-widget/3470/12
 class Toc:
@@ -30,8 +41,7 @@ class Toc:
             self._placeholder.markdown(contents_wrapped, unsafe_allow_html=True)
     
     def _markdown(self, text, level, space=""):
-        import re
-        key = re.sub('[^0-9a-zA-Z]+', '-', text).lower()
+        key = anchor(text)
         st.markdown(f"<div id='{key}'></div>", unsafe_allow_html=True)
         st.markdown(f"<{level}>{text}</{level}>", unsafe_allow_html=True)
         text_removed = re.sub('.*- ', "", text)
@@ -39,13 +49,13 @@ class Toc:
 
 # LOGO
 # https://discuss.streamlit.io/t/href-on-image/9693/4
-@st.cache(ttl=60*60*24*7, max_entries=300, allow_output_mutation=True)
+@data_cache(ttl=CACHE_TTL, max_entries=300)
 def get_base64_of_bin_file(bin_file):
     with open(bin_file, 'rb') as f:
         data = f.read()
     return base64.b64encode(data).decode()
 
-@st.cache(ttl=60*60*24*7, max_entries=300, allow_output_mutation=True)
+@data_cache(ttl=CACHE_TTL, max_entries=300)
 def get_img_with_href(local_img_path, target_url, max_width):
     img_format = os.path.splitext(local_img_path)[-1].replace('.', '')
     bin_str = get_base64_of_bin_file(local_img_path)
@@ -55,53 +65,57 @@ def get_img_with_href(local_img_path, target_url, max_width):
         </a>'''
     return html_code
 
-@st.cache(ttl=60*60*24*7, max_entries=300)
 def read_df(path:str):
-    return pd.read_csv(path)
+    # The mtime is part of the cache key, so an edited file is read again
+    return _read_df(path, os.stat(path).st_mtime_ns)
 
-@st.cache(ttl=60*60*24*7, max_entries=300)
+@data_cache(ttl=CACHE_TTL, max_entries=300)
+def _read_df(path:str, mtime:int):
+    return read_csv_cached(path)
+
+# DataFrame arguments are keyed by dataset version (or content for derived frames),
+# never pickled as st.cache used to do.
+@data_cache(ttl=CACHE_TTL, max_entries=300)
 def create_table(df, category_column:str, category_list:list, calculate_volume:bool, table_height:int):
-    category_returns = []
-    for cat in category_list:
-        df_cat = df[df[category_column]==cat]
-
-        dates = np.sort(df_cat["date"].unique())
-
-        prices = []
-        start_year = df_cat["date"].min()
-        if pd.isna(start_year):
-            continue
-        df_cat_date = df_cat[df_cat["date"]==start_year]
-        if calculate_volume: 
-            prices.append(df_cat_date["end_price"].sum())
-        else:
-            prices.append(df_cat_date["end_price"].mean())
-        price_changes = []
-        last_year = start_year
-        for date in dates[1:]:
-            df_cat_date = df_cat[df_cat["date"]==date]
-
-            start_sum = prices[-1]
-            end_sum = 0
-            if calculate_volume: 
-                end_sum = df_cat_date["end_price"].sum()
-            else:
-                end_sum = df_cat_date["end_price"].mean()
-
-            if start_sum == 0 or end_sum == 0:
-                continue
-            price_change = (end_sum - start_sum) / start_sum * 100 / (date-last_year)
-            price_changes.append(price_change) # Kasvu arvutus
-            prices.append(end_sum) # Jätame meelde selle aasta hinna
-            last_year = date
-        annual_return = round(np.mean(price_changes), 4)
-        total_return = round(annual_return * len(dates), 4)
-        if len(dates) == 1:
-            annual_return = 0
-            total_return = 0
-        year_span = " - ".join(map(str, [round(start_year), round(last_year)]))
-        category_returns.append([cat, year_span, total_return, annual_return])
-        
-    df_cat_returns = pd.DataFrame(category_returns, columns=["Kategooria", "Aastavahemik", "Kogukasv algusest (%)", "Iga-aastane kasv (%)"]) 
+    df = df[df[category_column].isin(category_list)]
+    n_dates = df.groupby(category_column, observed=True)["date"].nunique(dropna=False)
+
+    # One price per category and date, in date order
+    prices = df.groupby([category_column, "date"], observed=True, sort=True)["end_price"]
+    prices = prices.agg("sum" if calculate_volume else "mean").rename("price").reset_index()
+    cat = prices[category_column]
+    is_first = ~cat.duplicated()
+
+    # Years with a zero price are skipped, so growth is measured against the last non-zero year.
+    # A category that starts at zero never gets a starting price to grow from.
+    start_price = prices["price"][is_first].to_numpy()[is_first.cumsum() - 1]
+    prices = prices[is_first | ((prices["price"] != 0) & (start_price != 0))]
+    is_first = is_first[prices.index]
+    cat = prices[category_column]
+
+    previous = prices.groupby(cat, observed=True)[["date", "price"]].shift()
+    price_change = (prices["price"] - previous["price"]) / previous["price"] * 100 / (prices["date"] - previous["date"])
+    price_change = price_change[~is_first]
+    change_cat = cat[~is_first]
+    # Any undefined yearly change makes the category's average undefined
+    annual_return = price_change.groupby(change_cat, observed=True).mean()
+    annual_return = annual_return.where(~price_change.isna().groupby(change_cat, observed=True).any())
+
+    returns = prices.groupby(cat, observed=True)["date"].agg(["first", "last"])
+    returns["dates"] = n_dates
+    returns["annual_return"] = annual_return.reindex(returns.index).round(4)
+    returns["total_return"] = (returns["annual_return"] * returns["dates"]).round(4)
+    returns.loc[returns["dates"] == 1, ["annual_return", "total_return"]] = 0
+    returns["year_span"] = [" - ".join(map(str, [round(start), round(end)]))
+                            for start, end in zip(returns["first"], returns["last"])]
+
+    # Rows follow category_list, as categories without data are left out
+    returns = returns.reindex([c for c in category_list if c in returns.index])
+    df_cat_returns = pd.DataFrame({
+        "Kategooria": returns.index,
+        "Aastavahemik": returns["year_span"].to_numpy(),
+        "Kogukasv algusest (%)": returns["total_return"].to_numpy(),
+        "Iga-aastane kasv (%)": returns["annual_return"].to_numpy(),
+    })
     df_cat_returns = df_cat_returns.sort_values(by="Iga-aastane kasv (%)", ascending=False)
-    return df_cat_returns.drop("Kogukasv algusest (%)", axis=1)
\ No newline at end of file
+    return df_cat_returns.drop("Kogukasv algusest (%)", axis=1)
@@ -0,0 +1,81 @@
+"""Measure the payload of the row-level charts as the dataset grows.
+
+Run from the repository root:
+
+    python benchmarks/bench_charts.py [--scales 1 10 100] [--budget 5000]
+
+The Maa-amet rows are replicated (with jittered areas and prices) to each
+scale, and every chart is built both from the raw rows and through
+ChartData. The table shows markers sent to the browser, the size of the
+figure JSON and the build time.
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def scaled(df, scale: int, seed: int = 0):
+    import numpy as np
+    import pandas as pd
+
+    if scale == 1:
+        return df
+    rng = np.random.default_rng(seed)
+    big = pd.concat([df] * scale, ignore_index=True)
+    for column in ("average_area", "avg_price_eur", "total_volume_eur"):
+        big[column] = big[column] * rng.lognormal(0, 0.1, len(big))
+    return big
+
+
+def measure_chart(build, df):
+    start = time.perf_counter()
+    fig = build(df)
+    payload = len(fig.to_json())
+    elapsed = time.perf_counter() - start
+    points = sum(len(trace.x) for trace in fig.data)
+    modes = {trace.type for trace in fig.data}
+    return points, payload, elapsed, "/".join(sorted(modes))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--budget", type=int, help="point budget (default: ChartData.POINT_BUDGET)")
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    import plotly.express as px
+
+    import ChartData
+    import PageEngine
+    from DataRegistry import get_dataset
+
+    if args.budget:
+        ChartData.POINT_BUDGET = args.budget
+    raw = {
+        "price_vs_area": lambda df: px.scatter(df, x="average_area", y="avg_price_eur", color="county",
+                                               size="total_volume_eur", hover_data=["region"]),
+        "area_vs_volume": lambda df: px.scatter(df, x="average_area", y="total_volume_eur", color="land_type"),
+        "county_volume": lambda df: px.area(PageEngine.county_volumes(df), x="year", y="total_volume_eur",
+                                            color="county", line_group="land_type"),
+    }
+    layered = {name: (lambda df, f=getattr(PageEngine, name): f(df, {})) for name in raw}
+
+    base = get_dataset("maaamet_farm_forest_2022")
+    print(f"{'chart':<16} {'scale':>5} {'rows':>8} {'raw points':>11} {'raw KiB':>9} {'points':>7} "
+          f"{'KiB':>7} {'build ms':>9}  traces")
+    for scale in args.scales:
+        df = scaled(base, scale)
+        for name in raw:
+            raw_points, raw_payload, _, _ = measure_chart(raw[name], df)
+            points, payload, elapsed, modes = measure_chart(layered[name], df)
+            print(f"{name:<16} {scale:>5} {len(df):>8} {raw_points:>11} {raw_payload / 1024:>9.0f} {points:>7} "
+                  f"{payload / 1024:>7.0f} {elapsed * 1000:>9.0f}  {modes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Time a full headless execution of each index page.
+
+Run from the repository root:
+
+    python benchmarks/bench_pages.py [--runs 5] [--max-warm SECONDS]
+
+The first run of each page is cold (datasets, forecasts and figures are built
+or loaded); the following runs are reruns against warm caches, which is what
+every widget interaction and most page views cost. With --max-warm the script
+exits non-zero if a page's median warm run exceeds the budget, so it can guard
+the render path against regressions.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Without the background warm-up, so that the first run measures the cold render path
+os.environ.setdefault("LANDEX_WATCH_INTERVAL", "0")
+PAGES = ["1_🌳Estonian_Index_-_EN.py", os.path.join("pages", "2_🌳Estonian_Index_-_EE.py")]
+
+
+def time_page(path: str, runs: int):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(ROOT, path), default_timeout=600)
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        app.run()
+        timings.append(time.perf_counter() - start)
+        if app.exception:
+            raise RuntimeError(f"{path} raised: {app.exception[0].value}")
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="executions per page, the first one cold")
+    parser.add_argument("--max-warm", type=float, default=None, help="fail if a median warm run exceeds this (s)")
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    failed = False
+    print(f"{'page':<40} {'cold (s)':>9} {'warm median (s)':>16} {'warm min (s)':>13}")
+    for page in PAGES:
+        timings = time_page(page, max(args.runs, 2))
+        warm = statistics.median(timings[1:])
+        print(f"{os.path.basename(page):<40} {timings[0]:>9.3f} {warm:>16.3f} {min(timings[1:]):>13.3f}")
+        if args.max_warm is not None and warm > args.max_warm:
+            failed = True
+    if failed:
+        print(f"warm run exceeded the {args.max_warm}s budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Time each section of the index pages in a headless run.
+
+Run from the repository root:
+
+    python benchmarks/bench_sections.py [--locale en] [--runs 3] [--memory]
+
+The page is executed through Streamlit's AppTest with every
+PageEngine.render_section call timed. The first run is cold, the others are
+reruns against warm caches. With --memory each section's peak Python
+allocation is traced as well (tracemalloc slows every run down, so compare
+times only between runs with the same setting).
+"""
+import argparse
+import os
+import statistics
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Without the background warm-up, so that the first run measures the cold render path
+os.environ.setdefault("LANDEX_WATCH_INTERVAL", "0")
+
+
+def _timed_page(locale, trace_memory):
+    # Executed by AppTest as a page script, so it imports what it needs itself.
+    import time
+    import tracemalloc
+
+    import streamlit as st
+
+    import PageEngine
+
+    render_section = PageEngine.render_section
+    timings = []
+
+    def timed_section(section, *args, **kwargs):
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            return render_section(section, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+            if trace_memory:
+                tracemalloc.stop()
+            timings.append((section.key, elapsed, peak))
+
+    PageEngine.render_section = timed_section
+    try:
+        PageEngine.render_page(locale)
+    finally:
+        PageEngine.render_section = render_section
+    st.session_state["section_timings"] = timings
+
+
+def run(locale: str, runs: int, trace_memory: bool):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_function(_timed_page, args=(locale, trace_memory), default_timeout=600)
+    results = []
+    for _ in range(runs):
+        app.run()
+        if app.exception:
+            raise RuntimeError(app.exception[0].value)
+        results.append(app.session_state["section_timings"])
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--locale", default="en", choices=["en", "ee"])
+    parser.add_argument("--runs", type=int, default=3, help="executions of the page, the first one cold")
+    parser.add_argument("--memory", action="store_true", help="also report peak allocation per section")
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+    results = run(args.locale, max(args.runs, 2), args.memory)
+    cold, warm = results[0], results[1:]
+
+    header = f"{'section':<24} {'cold (ms)':>10} {'warm median (ms)':>17}"
+    if args.memory:
+        header += f" {'cold peak (KiB)':>16} {'warm peak (KiB)':>16}"
+    print(header)
+    for i, (key, elapsed, peak) in enumerate(cold):
+        warm_ms = statistics.median(run[i][1] for run in warm) * 1000
+        line = f"{key:<24} {elapsed * 1000:>10.1f} {warm_ms:>17.1f}"
+        if args.memory:
+            warm_peak = max(run[i][2] for run in warm)
+            line += f" {peak / 1024:>16.0f} {warm_peak / 1024:>16.0f}"
+        print(line)
+    total_warm = statistics.median(sum(t for _, t, _ in run) for run in warm)
+    print(f"{'total':<24} {sum(t for _, t, _ in cold) * 1000:>10.1f} {total_warm * 1000:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Profile the import time of the page entry points.
+
+Run from the repository root:
+
+    python benchmarks/import_profile.py [--repeat 5] [--write]
+
+Each target is imported in a fresh interpreter with `python -X importtime`.
+The report lists the median total and the slowest top-level dependencies;
+--write saves it to benchmarks/import_profile.txt, which is checked in so that
+a change pulling a heavy module back onto the start-up path shows in review.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPORT = os.path.join(ROOT, "benchmarks", "import_profile.txt")
+
+# What a page needs before drawing anything, and what a forecast section adds.
+TARGETS = ["PageEngine", "prophet.plot"]
+
+
+def import_times(module: str):
+    """Return {name: cumulative microseconds} for `module` and its direct imports, in a fresh interpreter."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        entries.append((len(name) - len(name.lstrip()), name.strip(), int(cumulative)))
+
+    # -X importtime prints a module after everything it imports, nested one
+    # level deeper, so the target's direct imports are the entries just before
+    # it at the next indentation level.
+    index = max(i for i, (_, name, _) in enumerate(entries) if name == module)
+    depth = entries[index][0]
+    times = {module: entries[index][2]}
+    for indent, name, cumulative in reversed(entries[:index]):
+        if indent <= depth:
+            break
+        if indent == depth + 2:
+            times[name] = cumulative
+    return times
+
+
+def profile(module: str, repeat: int, top: int):
+    runs = [import_times(module) for _ in range(repeat)]
+    total = statistics.median(run[module] for run in runs)
+    children = {name for run in runs for name in run if name != module}
+    medians = {name: statistics.median(run.get(name, 0) for run in runs) for name in children}
+    lines = [f"{module}: {total / 1000:.0f} ms (median of {repeat})"]
+    for name, us in sorted(medians.items(), key=lambda item: -item[1])[:top]:
+        lines.append(f"  {us / 1000:>8.0f} ms  {name}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="dependencies listed per target")
+    parser.add_argument("--write", action="store_true", help=f"save the report to {os.path.relpath(REPORT, ROOT)}")
+    args = parser.parse_args(argv)
+
+    report = []
+    for module in TARGETS:
+        report += profile(module, args.repeat, args.top) + [""]
+    print("\n".join(report))
+    if args.write:
+        with open(REPORT, "w") as f:
+            f.write("\n".join(report).rstrip() + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Simulate concurrent browser sessions against a local Streamlit server.
+
+Run from the repository root:
+
+    python benchmarks/load_test.py [--sessions 20] [--reruns 5] [--page ee]
+
+A server is started on --port (unless --url points at one already running,
+e.g. behind nginx), then every simulated session opens the same websocket a
+browser does and requests --reruns full executions of the page, one after the
+other. The render latency of a request is the time from sending it to the
+server's script_finished message. Requires the `websockets` package.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN_SCRIPT = "1_🌳Estonian_Index_-_EN.py"
+PAGES = {"en": "", "ee": "Estonian_Index_-_EE"}
+
+
+def start_server(port: int):
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", MAIN_SCRIPT, "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://localhost:{port}/_stcore/health", timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Streamlit server did not become healthy within 60s")
+
+
+def run_session(url: str, page_name: str, reruns: int):
+    from streamlit.proto.BackMsg_pb2 import BackMsg
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+    from websockets.sync.client import connect
+
+    latencies = []
+    request = BackMsg()
+    request.rerun_script.query_string = ""
+    request.rerun_script.page_name = page_name
+    payload = request.SerializeToString()
+    with connect(f"{url}/_stcore/stream", subprotocols=["streamlit"], max_size=None) as ws:
+        for _ in range(reruns):
+            start = time.perf_counter()
+            ws.send(payload)
+            while True:
+                message = ForwardMsg()
+                message.ParseFromString(ws.recv())
+                if message.WhichOneof("type") == "script_finished":
+                    break
+            latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def percentile(values, q: int) -> float:
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent sessions")
+    parser.add_argument("--reruns", type=int, default=5, help="page executions per session")
+    parser.add_argument("--page", default="en", choices=sorted(PAGES))
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--url", help="websocket base URL of a running server, e.g. ws://localhost:8501")
+    args = parser.parse_args(argv)
+
+    server = None if args.url else start_server(args.port)
+    url = args.url or f"ws://localhost:{args.port}"
+    try:
+        # One session first, so that the measurement is of a warm server
+        warmup = run_session(url, PAGES[args.page], 1)[0]
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+            sessions = list(pool.map(lambda _: run_session(url, PAGES[args.page], args.reruns),
+                                     range(args.sessions)))
+        elapsed = time.perf_counter() - start
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    latencies = [latency for session in sessions for latency in session]
+    print(f"page {args.page}: {args.sessions} sessions x {args.reruns} reruns in {elapsed:.1f}s "
+          f"(warm-up run {warmup:.2f}s)")
+    print(f"render latency  p50 {percentile(latencies, 50):.3f}s  p95 {percentile(latencies, 95):.3f}s  "
+          f"max {max(latencies):.3f}s  throughput {len(latencies) / elapsed:.1f} runs/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from StreamlitHelper import create_table
+
+CATEGORIES = ["Harju", "Tartu", "Hiiu", "Valga", "Saare"]
+
+
+def loop_create_table(df, category_column, category_list, calculate_volume, table_height):
+    # The nested-loop implementation create_table replaced, kept as the reference.
+    category_returns = []
+    for cat in category_list:
+        df_cat = df[df[category_column]==cat]
+
+        dates = np.sort(df_cat["date"].unique())
+
+        prices = []
+        start_year = df_cat["date"].min()
+        if pd.isna(start_year):
+            continue
+        df_cat_date = df_cat[df_cat["date"]==start_year]
+        if calculate_volume:
+            prices.append(df_cat_date["end_price"].sum())
+        else:
+            prices.append(df_cat_date["end_price"].mean())
+        price_changes = []
+        last_year = start_year
+        for date in dates[1:]:
+            df_cat_date = df_cat[df_cat["date"]==date]
+
+            start_sum = prices[-1]
+            end_sum = 0
+            if calculate_volume:
+                end_sum = df_cat_date["end_price"].sum()
+            else:
+                end_sum = df_cat_date["end_price"].mean()
+
+            if start_sum == 0 or end_sum == 0:
+                continue
+            price_change = (end_sum - start_sum) / start_sum * 100 / (date-last_year)
+            price_changes.append(price_change)
+            prices.append(end_sum)
+            last_year = date
+        with warnings.catch_warnings():
+            # np.mean of no changes is NaN, with a warning
+            warnings.simplefilter("ignore", RuntimeWarning)
+            annual_return = round(np.mean(price_changes), 4)
+        total_return = round(annual_return * len(dates), 4)
+        if len(dates) == 1:
+            annual_return = 0
+            total_return = 0
+        year_span = " - ".join(map(str, [round(start_year), round(last_year)]))
+        category_returns.append([cat, year_span, total_return, annual_return])
+
+    df_cat_returns = pd.DataFrame(category_returns, columns=["Kategooria", "Aastavahemik", "Kogukasv algusest (%)", "Iga-aastane kasv (%)"])
+    df_cat_returns = df_cat_returns.sort_values(by="Iga-aastane kasv (%)", ascending=False)
+    return df_cat_returns.drop("Kogukasv algusest (%)", axis=1)
+
+
+def random_frame(rng, rows=None, zero_share=0.1, nan_share=0.05):
+    rows = rows if rows is not None else int(rng.integers(1, 80))
+    # Only some of CATEGORIES occur, so the others are absent from the data
+    present = rng.choice(CATEGORIES, size=int(rng.integers(1, len(CATEGORIES) + 1)), replace=False)
+    prices = rng.uniform(1, 5000, rows).round(1)
+    prices[rng.random(rows) < zero_share] = 0
+    prices[rng.random(rows) < nan_share] = np.nan
+    return pd.DataFrame({
+        "county": rng.choice(present, rows),
+        "date": rng.integers(2000, 2023, rows),
+        "end_price": prices,
+    })
+
+
+def assert_same_table(df, calculate_volume, category_list=CATEGORIES):
+    expected = loop_create_table(df, "county", category_list, calculate_volume, 300)
+    actual = create_table.__wrapped__(df, "county", category_list, calculate_volume, 300)
+    pd.testing.assert_frame_equal(actual.reset_index(drop=True), expected.reset_index(drop=True),
+                                  check_dtype=False)
+
+
+@pytest.mark.parametrize("calculate_volume", [True, False])
+@pytest.mark.parametrize("seed", range(100))
+def test_random_frames(seed, calculate_volume):
+    assert_same_table(random_frame(np.random.default_rng(seed)), calculate_volume)
+
+
+@pytest.mark.parametrize("calculate_volume", [True, False])
+def test_zero_prices(calculate_volume):
+    df = pd.DataFrame({
+        "county": ["Harju"] * 5 + ["Tartu"] * 3,
+        # Harju has a zero year in the middle, Tartu starts at zero
+        "date": [2000, 2001, 2002, 2003, 2003, 2000, 2001, 2002],
+        "end_price": [100.0, 0.0, 150.0, 90.0, 30.0, 0.0, 50.0, 60.0],
+    })
+    assert_same_table(df, calculate_volume)
+
+
+@pytest.mark.parametrize("calculate_volume", [True, False])
+def test_nan_prices(calculate_volume):
+    df = pd.DataFrame({
+        "county": ["Harju"] * 4 + ["Tartu"] * 3,
+        "date": [2000, 2001, 2002, 2002, 2000, 2001, 2002],
+        "end_price": [100.0, np.nan, 150.0, np.nan, np.nan, np.nan, 60.0],
+    })
+    assert_same_table(df, calculate_volume)
+
+
+@pytest.mark.parametrize("calculate_volume", [True, False])
+def test_single_date(calculate_volume):
+    df = pd.DataFrame({
+        "county": ["Harju", "Harju", "Tartu"],
+        "date": [2010, 2010, 2015],
+        "end_price": [100.0, 200.0, 0.0],
+    })
+    assert_same_table(df, calculate_volume)
+
+
+def test_absent_categories():
+    df = random_frame(np.random.default_rng(1), rows=50)
+    # Categories without rows are left out of the table, not reported as empty
+    assert_same_table(df, True, category_list=["Nope"] + CATEGORIES + ["Also nope"])
+    assert_same_table(df.iloc[:0], True)
+
+
+def test_region_history():
+    # Many categories over the full history, as on the region-level pages
+    rng = np.random.default_rng(7)
+    regions = [f"region {i}" for i in range(60)]
+    df = pd.DataFrame({
+        "region": rng.choice(regions, 5000),
+        "date": rng.integers(2000, 2023, 5000),
+        "end_price": rng.uniform(0, 5000, 5000).round(0),
+    })
+    expected = loop_create_table(df, "region", regions, False, 300)
+    actual = create_table.__wrapped__(df, "region", regions, False, 300)
+    pd.testing.assert_frame_equal(actual.reset_index(drop=True), expected.reset_index(drop=True),
+                                  check_dtype=False)